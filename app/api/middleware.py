@@ -4,9 +4,10 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import time
+import uuid
 
 from app.core.exceptions import StockXRepricerException
-from app.core.logging import get_logger
+from app.core.logging import get_logger, request_id_var
 
 logger = get_logger(__name__)
 
@@ -39,8 +40,14 @@ async def exception_handler_middleware(request: Request, call_next):
 
 
 async def logging_middleware(request: Request, call_next):
-    """Middleware for logging requests and responses."""
+    """Middleware for logging requests and responses.
+
+    Tags every log line emitted while handling the request with its ID,
+    taken from the X-Request-ID header or generated, and echoes it back.
+    """
     start_time = time.time()
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
 
     # Log request
     logger.info(
@@ -52,25 +59,29 @@ async def logging_middleware(request: Request, call_next):
         }
     )
 
-    # Process request
-    response = await call_next(request)
-
-    # Calculate duration
-    duration = time.time() - start_time
+    try:
+        # Process request
+        response = await call_next(request)
 
-    # Log response
-    logger.info(
-        f"Request completed: {request.method} {request.url.path} - "
-        f"Status: {response.status_code} - Duration: {duration:.3f}s",
-        extra={
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "duration": duration
-        }
-    )
+        # Calculate duration
+        duration = time.time() - start_time
+
+        # Log response
+        logger.info(
+            f"Request completed: {request.method} {request.url.path} - "
+            f"Status: {response.status_code} - Duration: {duration:.3f}s",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration": duration
+            }
+        )
 
-    return response
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
 
 
 def setup_exception_handlers(app):
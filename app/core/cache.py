@@ -0,0 +1,141 @@
+"""In-process caching utilities."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded LRU cache whose entries expire after a fixed time-to-live.
+
+    Intended for use from a single event loop; no locking is performed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Default lifetime of an entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key, or default if absent or expired.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Lifetime in seconds, overriding the cache default
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default if absent or expired."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        del self._entries[key]
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight(Generic[V]):
+    """
+    Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the call as a task owned by this
+    object; every caller, the first included, awaits that task through a
+    shield. Cancelling one caller therefore never cancels the others. The
+    shared call is cancelled only once no caller is waiting for it.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[Hashable, "asyncio.Future[V]"] = {}
+        self._waiters: Dict["asyncio.Future[V]", int] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[V]]) -> V:
+        """
+        Run call for key, or join the call already in flight for it.
+
+        Args:
+            key: Key identifying equivalent calls
+            call: Zero-argument coroutine function to run on behalf of all callers
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            remaining = self._waiters[task] - 1
+            if remaining:
+                self._waiters[task] = remaining
+            else:
+                del self._waiters[task]
+                # Nobody is left to use the result, so stop the work
+                if not task.done():
+                    task.cancel()
+
+    def _finish(self, key: Hashable, task: "asyncio.Future[V]") -> None:
+        """Forget a finished call and mark its outcome retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
@@ -0,0 +1,54 @@
+"""Structured concurrency helpers for awaiting independent I/O together."""
+import asyncio
+from typing import Any, Awaitable, List
+
+
+def discard(task: asyncio.Future) -> None:
+    """Cancel a task that is no longer needed and drop any exception it already raised."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def gather_cancelling(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Await several awaitables concurrently, cancelling the rest on the first failure.
+
+    Unlike asyncio.gather, siblings of a failed awaitable do not keep running
+    and holding connections; they are cancelled and awaited before the error
+    is raised. Unlike asyncio.TaskGroup, the original exception is raised
+    as-is instead of inside an ExceptionGroup, so callers' existing except
+    clauses still match. Cancelling the caller cancels every awaitable.
+
+    Args:
+        *aws: Coroutines or futures to run
+
+    Returns:
+        Results in the same order as the awaitables
+
+    Raises:
+        Exception: The first exception raised by any awaitable
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        # Let cancelled siblings finish their cleanup (connections, semaphores)
+        # before control returns to the caller
+        if pending:
+            await asyncio.wait(pending)
+
+    # Retrieve every failure so none is logged as never retrieved, then raise the first
+    errors = [
+        task.exception() for task in tasks
+        if task.done() and not task.cancelled() and task.exception() is not None
+    ]
+    if errors:
+        raise errors[0]  # type: ignore[misc]
+
+    return [task.result() for task in tasks]
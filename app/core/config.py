@@ -31,10 +31,20 @@ class Settings(BaseSettings):
     stockx_audience: Optional[str] = None
     stockx_refresh_token: Optional[str] = None
     stockx_auth_content_type: Optional[str] = None
+    stockx_catalog_cache_ttl_seconds: float = 300.0
+    stockx_market_data_cache_ttl_seconds: float = 30.0
+    stockx_max_concurrency: int = 10
 
     # External StockX Market Data API Settings
     external_stockx_api_token: Optional[str] = None
+    external_stockx_initial_concurrency: int = 8
+    external_stockx_max_concurrency: int = 32
+    external_stockx_rate_limit_rpm: int = 300
+    external_stockx_target_latency_seconds: float = 2.0
+    external_stockx_cache_ttl_seconds: float = 60.0
 
+    # Market Data Settings
+    market_data_cache_ttl_seconds: float = 60.0
 
     # Pricing Configuration
     default_margin_percentage: float = 10.0
@@ -1,25 +1,41 @@
 """Enhanced logging configuration for the application."""
 import logging
 import sys
+from contextvars import ContextVar
+from functools import cached_property
 
 from app.core.config import settings
 
+# ID of the HTTP request being handled, set by the logging middleware
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the current request ID from request_id_var."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
 
 def setup_logging() -> None:
     """Configure application logging with structured format."""
 
     log_format = (
-        "%(asctime)s - %(name)s - %(levelname)s - "
+        "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] "
         "%(funcName)s:%(lineno)d - %(message)s"
     )
 
+    # Every record passing through the handler carries the request ID,
+    # including those from third-party loggers
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestIdFilter())
+
     # Configure root logger
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
         format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[handler]
     )
 
     # Set specific loggers
@@ -43,7 +59,7 @@ def get_logger(name: str) -> logging.Logger:
 class LoggerMixin:
     """Mixin class to add logging capability to any class."""
 
-    @property
+    @cached_property
     def logger(self) -> logging.Logger:
-        """Get logger instance for the class."""
+        """Get logger instance for the class, resolved once per instance."""
         return get_logger(self.__class__.__name__)
@@ -1,8 +1,9 @@
 """
 Factories for creating external market data domain entities.
 """
+import sys
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from decimal import Decimal
 from app.domain.external_market_data.sale import Sale
 from app.domain.external_market_data.bid import Bid
@@ -15,7 +16,12 @@ class SaleFactory:
     """Factory for creating Sale domain entities."""
 
     @staticmethod
-    def from_external_api(api_data: Dict[str, Any], product_id: str, is_variant: bool) -> Sale:
+    def from_external_api(
+        api_data: Dict[str, Any],
+        product_id: str,
+        is_variant: bool,
+        now: Optional[datetime] = None
+    ) -> Sale:
         """
         Create Sale entity from external API node data.
 
@@ -23,6 +29,8 @@ class SaleFactory:
             api_data: Dictionary from external API (the "node" object)
             product_id: The product or variant ID this sale belongs to
             is_variant: Whether the product_id is a variant ID
+            now: Fallback timestamp when createdAt is missing or invalid;
+                pass one value for a whole batch to avoid a clock read per sale
 
         Returns:
             Sale domain entity
@@ -42,14 +50,15 @@ class SaleFactory:
         )
 
         # Parse created_at timestamp
+        created_at = None
         created_at_str = api_data.get('createdAt')
         if created_at_str:
             try:
                 created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
             except (ValueError, AttributeError):
-                created_at = datetime.utcnow()
-        else:
-            created_at = datetime.utcnow()
+                pass
+        if created_at is None:
+            created_at = now or datetime.utcnow()
 
         # Extract associated variant size if available
         size = None
@@ -61,7 +70,15 @@ class SaleFactory:
         # Extract order type
         order_type = api_data.get('orderType')
 
-        return Sale(
+        # Sizes and order types repeat across a batch; intern them so every
+        # sale shares one string object per distinct value
+        if isinstance(size, str):
+            size = sys.intern(size)
+        if isinstance(order_type, str):
+            order_type = sys.intern(order_type)
+
+        # Every field is already typed above, so skip re-validating the model
+        return Sale.model_construct(
             amount=amount,
             created_at=created_at,
             product_id=product_id,
@@ -218,7 +235,8 @@ class HistoricalSaleFactory:
         except (ValueError, TypeError) as e:
             raise ValueError(f"Invalid yValue: {e}")
 
-        return HistoricalSale(
+        # Every field is already typed above, so skip re-validating the model
+        return HistoricalSale.model_construct(
             date=date,
             price=price,
             product_id=product_id,
@@ -4,7 +4,7 @@ Domain factories for creating domain entities from external data.
 Factories encapsulate the logic of creating complex domain objects,
 ensuring all business rules and validations are applied.
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, Any, Optional
 from app.domain.product import Product
@@ -15,6 +15,33 @@ from app.domain.value_objects import (
     MarketData, ListingStatus, InventoryType
 )
 
+# MarketData price fields as (field, response section or None for top level, response key)
+_MARKET_DATA_PRICE_FIELDS = (
+    # Top-level
+    ('highest_bid', None, 'highestBidAmount'),
+    ('lowest_ask', None, 'lowestAskAmount'),
+    ('flex_lowest_ask', None, 'flexLowestAskAmount'),
+    ('earn_more', None, 'earnMoreAmount'),
+    ('sell_faster', None, 'sellFasterAmount'),
+    # Standard market data
+    ('standard_lowest_ask', 'standardMarketData', 'lowestAsk'),
+    ('standard_highest_bid', 'standardMarketData', 'highestBidAmount'),
+    ('standard_sell_faster', 'standardMarketData', 'sellFaster'),
+    ('standard_earn_more', 'standardMarketData', 'earnMore'),
+    ('standard_beat_us', 'standardMarketData', 'beatUS'),
+    # Flex market data
+    ('flex_highest_bid', 'flexMarketData', 'highestBidAmount'),
+    ('flex_sell_faster', 'flexMarketData', 'sellFaster'),
+    ('flex_earn_more', 'flexMarketData', 'earnMore'),
+    ('flex_beat_us', 'flexMarketData', 'beatUS'),
+    # Direct market data
+    ('direct_lowest_ask', 'directMarketData', 'lowestAsk'),
+    ('direct_highest_bid', 'directMarketData', 'highestBidAmount'),
+    ('direct_sell_faster', 'directMarketData', 'sellFaster'),
+    ('direct_earn_more', 'directMarketData', 'earnMore'),
+    ('direct_beat_us', 'directMarketData', 'beatUS'),
+)
+
 
 class ProductFactory:
     """Factory for creating Product domain entities."""
@@ -102,18 +129,55 @@ class ProductFactory:
 
         return Product.from_dict(clean_data)
 
+    @staticmethod
+    def from_document(document: Any) -> Product:
+        """
+        Create Product entity directly from a stored product document.
+
+        Reads the document's attributes instead of dumping it with .dict()
+        and filtering the result.
+
+        Args:
+            document: Product database document
+
+        Returns:
+            Product domain entity
+        """
+        retail_price = document.retail_price
+        return Product.from_dict({
+            'product_id': document.product_id,
+            'title': document.title,
+            'brand': document.brand,
+            'style_id': document.style_id,
+            'product_type': document.product_type,
+            'url_key': document.url_key,
+            'retail_price': Money(
+                amount=Decimal(str(retail_price)),
+                currency_code='USD'
+            ) if retail_price is not None else None,
+            'release_date': document.release_date,
+            'created_at': document.created_at,
+            'updated_at': document.updated_at
+        })
+
 
 class VariantFactory:
     """Factory for creating Variant domain entities."""
 
     @staticmethod
-    def from_stockx_api(api_data: Dict[str, Any], include_market_data: bool = False) -> Variant:
+    def from_stockx_api(
+        api_data: Dict[str, Any],
+        include_market_data: bool = False,
+        now: Optional[datetime] = None
+    ) -> Variant:
         """
         Create Variant entity from StockX API response.
 
         Args:
             api_data: Dictionary from StockX API mapper
             include_market_data: Whether to include market data if present
+            now: Timestamp for missing created_at/updated_at; pass one per batch
+                to avoid reading the clock for every entity
 
         Returns:
             Variant domain entity
@@ -139,13 +203,13 @@ class VariantFactory:
         if isinstance(created_at, str):
             created_at = datetime.fromisoformat(created_at)
         elif created_at is None:
-            created_at = datetime.utcnow()
+            created_at = now = now or datetime.utcnow()
 
         updated_at = api_data.get('updated_at')
         if isinstance(updated_at, str):
             updated_at = datetime.fromisoformat(updated_at)
         elif updated_at is None:
-            updated_at = datetime.utcnow()
+            updated_at = now or datetime.utcnow()
 
         # Handle market data if requested
         market_data = None
@@ -179,17 +243,43 @@ class VariantFactory:
 
         return Variant.from_dict(clean_data)
 
+    @staticmethod
+    def from_document(document: Any) -> Variant:
+        """
+        Create Variant entity directly from a stored variant document.
+
+        Unlike from_database(document.dict()), this never serializes the
+        linked product document only to discard it.
+
+        Args:
+            document: Variant database document
+
+        Returns:
+            Variant domain entity
+        """
+        return Variant.from_dict({
+            'variant_id': document.variant_id,
+            'product_id': document.product_id,
+            'variant_name': document.variant_name,
+            'variant_value': document.variant_value,
+            'upc': document.upc,
+            'created_at': document.created_at,
+            'updated_at': document.updated_at
+        })
+
 
 class ListingFactory:
     """Factory for creating Listing domain entities."""
 
     @staticmethod
-    def from_stockx_api(api_data: Dict[str, Any]) -> Listing:
+    def from_stockx_api(api_data: Dict[str, Any], now: Optional[datetime] = None) -> Listing:
         """
         Create Listing entity from StockX API response.
 
         Args:
             api_data: Dictionary from StockX API mapper
+            now: Timestamp for missing created_at/updated_at; pass one per batch
+                to avoid reading the clock for every entity
 
         Returns:
             Listing domain entity
@@ -230,13 +320,13 @@ class ListingFactory:
         if isinstance(created_at, str):
             created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
         elif created_at is None:
-            created_at = datetime.utcnow()
+            created_at = now = now or datetime.now(timezone.utc)
 
         updated_at = api_data.get('updated_at')
         if isinstance(updated_at, str):
             updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
         elif updated_at is None:
-            updated_at = datetime.utcnow()
+            updated_at = now or datetime.now(timezone.utc)
 
         ask_expires_at = None
         if api_data.get('ask_expires_at'):
@@ -316,43 +406,28 @@ class MarketDataFactory:
         """
         currency_code = api_data.get('currencyCode', api_data.get('currency_code', 'USD'))
 
-        # Helper to create Money if value exists
-        def make_money(value: Optional[float]) -> Optional[Money]:
-            if value is not None:
-                return Money(amount=Decimal(str(value)), currency_code=currency_code)
-            return None
-
-        # Extract nested market data
-        standard_data = api_data.get('standardMarketData', {})
-        flex_data = api_data.get('flexMarketData', {})
-        direct_data = api_data.get('directMarketData', {})
+        # Resolve each response section once; a null section counts as empty
+        sections = {
+            None: api_data,
+            'standardMarketData': api_data.get('standardMarketData') or {},
+            'flexMarketData': api_data.get('flexMarketData') or {},
+            'directMarketData': api_data.get('directMarketData') or {},
+        }
+
+        # Fields of an empty tier stay None without being looked up
+        prices: Dict[str, Optional[Money]] = {}
+        for field, section, key in _MARKET_DATA_PRICE_FIELDS:
+            section_data = sections[section]
+            value = section_data.get(key) if section_data else None
+            prices[field] = (
+                Money(amount=Decimal(str(value)), currency_code=currency_code)
+                if value is not None else None
+            )
 
         return MarketData(
             product_id=ProductId(value=api_data['productId']) if api_data.get('productId') else None,
             variant_id=VariantId(value=api_data['variantId']) if api_data.get('variantId') else None,
             currency_code=currency_code,
-            # Top-level
-            highest_bid=make_money(api_data.get('highestBidAmount')),
-            lowest_ask=make_money(api_data.get('lowestAskAmount')),
-            flex_lowest_ask=make_money(api_data.get('flexLowestAskAmount')),
-            earn_more=make_money(api_data.get('earnMoreAmount')),
-            sell_faster=make_money(api_data.get('sellFasterAmount')),
-            # Standard market data
-            standard_lowest_ask=make_money(standard_data.get('lowestAsk')),
-            standard_highest_bid=make_money(standard_data.get('highestBidAmount')),
-            standard_sell_faster=make_money(standard_data.get('sellFaster')),
-            standard_earn_more=make_money(standard_data.get('earnMore')),
-            standard_beat_us=make_money(standard_data.get('beatUS')),
-            # Flex market data
-            flex_highest_bid=make_money(flex_data.get('highestBidAmount')),
-            flex_sell_faster=make_money(flex_data.get('sellFaster')),
-            flex_earn_more=make_money(flex_data.get('earnMore')),
-            flex_beat_us=make_money(flex_data.get('beatUS')),
-            # Direct market data
-            direct_lowest_ask=make_money(direct_data.get('lowestAsk')),
-            direct_highest_bid=make_money(direct_data.get('highestBidAmount')),
-            direct_sell_faster=make_money(direct_data.get('sellFaster')),
-            direct_earn_more=make_money(direct_data.get('earnMore')),
-            direct_beat_us=make_money(direct_data.get('beatUS')),
+            **prices,
             snapshot_time=datetime.utcnow()
         )
@@ -1,7 +1,7 @@
 """
 Listing domain entity.
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 from app.domain.value_objects import (
@@ -10,6 +10,11 @@ from app.domain.value_objects import (
 )
 
 
+def _utc_now() -> datetime:
+    """Current time as an aware UTC datetime, matching timestamps parsed from StockX."""
+    return datetime.now(timezone.utc)
+
+
 class Listing(BaseModel):
     """
     Listing entity representing an active or historical listing.
@@ -43,8 +48,8 @@ class Listing(BaseModel):
     batch_id: Optional[str] = Field(None, description="Batch operation ID if created in batch")
     task_id: Optional[str] = Field(None, description="Task ID if created in batch")
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utc_now)
+    updated_at: datetime = Field(default_factory=_utc_now)
 
     class Config:
         frozen = False
@@ -93,7 +98,7 @@ class Listing(BaseModel):
             raise ValueError("Cannot update price of a cancelled listing")
 
         self.amount = new_amount
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     def activate(self) -> None:
         """
@@ -108,7 +113,7 @@ class Listing(BaseModel):
             return  # Already active, no-op
 
         self.status = ListingStatus.ACTIVE
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     def deactivate(self) -> None:
         """Deactivate the listing (temporarily)."""
@@ -118,7 +123,7 @@ class Listing(BaseModel):
             raise ValueError("Cannot deactivate a cancelled listing")
 
         self.status = ListingStatus.INACTIVE
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     def mark_as_sold(self) -> None:
         """
@@ -130,7 +135,7 @@ class Listing(BaseModel):
             raise ValueError("Cannot mark cancelled listing as sold")
 
         self.status = ListingStatus.SOLD
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     def cancel(self) -> None:
         """
@@ -147,7 +152,7 @@ class Listing(BaseModel):
             return  # Already cancelled, no-op
 
         self.status = ListingStatus.CANCELLED
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     def expire(self) -> None:
         """Mark listing as expired."""
@@ -155,7 +160,7 @@ class Listing(BaseModel):
             raise ValueError(f"Cannot expire a {self.status.value} listing")
 
         self.status = ListingStatus.EXPIRED
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     def update_quantity(self, new_quantity: int) -> None:
         """
@@ -177,7 +182,7 @@ class Listing(BaseModel):
             raise ValueError("Cannot update quantity of cancelled listing")
 
         self.quantity = new_quantity
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utc_now()
 
     # Query methods
 
@@ -202,12 +207,12 @@ class Listing(BaseModel):
         if self.status == ListingStatus.EXPIRED:
             return True
         if self.ask_expires_at:
-            return datetime.utcnow() > self.ask_expires_at
+            return _utc_now() > self.ask_expires_at
         return False
 
     def days_active(self) -> int:
         """Calculate how many days the listing has been active."""
-        return (datetime.utcnow() - self.created_at).days
+        return (_utc_now() - self.created_at).days
 
     def belongs_to_variant(self, variant_id: VariantId) -> bool:
         """Check if listing belongs to specific variant."""
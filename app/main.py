@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,6 +15,7 @@ from app.api.routes.stockx import stockx_routes, auth as stockx_auth, external_m
 from app.api.routes.product import product_routes
 from app.api.routes.market_data import market_data_routes
 from app.api.middleware import logging_middleware, setup_exception_handlers
+from app.services.stockx import auth_service, stockx_service
 
 # Setup logging
 setup_logging()
@@ -33,10 +35,22 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
+    # Keep the StockX token fresh in the background so requests never wait on a refresh
+    token_refresher = (
+        asyncio.create_task(auth_service.run_refresher())
+        if auth_service.has_credentials() else None
+    )
+
     yield
 
     # Shutdown
     logger.info("Application shutting down...")
+    if token_refresher is not None:
+        token_refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await token_refresher
+    await stockx_service.aclose()
+    await auth_service.aclose()
     await db.close_database_connection()
 
 
@@ -1,7 +1,8 @@
 """Historical pricing data model for MongoDB Time Series Collection."""
 from datetime import datetime
-from beanie import Document
-from pydantic import Field
+import pymongo
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
 
 
 class HistoricalPricing(Document):
@@ -36,3 +37,16 @@ class HistoricalPricing(Document):
             "granularity": "hours"          # Data bucketing: seconds/minutes/hours
         }
         # Note: Time series collections are automatically indexed on time_field
+        # Compound index for per-variant lookups sorted by newest first
+        indexes = [
+            [("variant_db_id", pymongo.ASCENDING), ("date", pymongo.DESCENDING)]
+        ]
+
+
+class HistoricalPricingSummary(BaseModel):
+    """Projection of a HistoricalPricing point with only the fields served by the read API."""
+
+    id: PydanticObjectId = Field(..., alias="_id")
+    variant_id: str
+    date: datetime
+    price: float
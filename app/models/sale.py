@@ -1,8 +1,9 @@
 """Sale data model for MongoDB Time Series Collection."""
 from datetime import datetime
 from typing import Optional
-from beanie import Document
-from pydantic import Field
+import pymongo
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
 
 
 class Sale(Document):
@@ -40,3 +41,19 @@ class Sale(Document):
             "granularity": "hours"          # Data bucketing: seconds/minutes/hours
         }
         # Note: Time series collections are automatically indexed on time_field
+        # Compound index for per-variant lookups sorted by newest first
+        indexes = [
+            [("variant_db_id", pymongo.ASCENDING), ("sale_date", pymongo.DESCENDING)]
+        ]
+
+
+class SaleSummary(BaseModel):
+    """Projection of a Sale with only the fields served by the read API."""
+
+    id: PydanticObjectId = Field(..., alias="_id")
+    variant_id: str
+    sale_date: datetime
+    amount: float
+    currency_code: str = "USD"
+    size: Optional[str] = None
+    order_type: Optional[str] = None
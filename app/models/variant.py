@@ -28,6 +28,7 @@ class Variant(Document):
         name = "variants"
         indexes = [
             "variant_id",
+            "product_id",
             "product",
             "upc"
         ]
@@ -1,4 +1,5 @@
 """Base repository with common CRUD operations."""
+from datetime import datetime, timezone
 from typing import Generic, TypeVar, Type, Optional, List, Any
 from beanie import Document
 from app.core.exceptions import DatabaseException
@@ -7,6 +8,23 @@ from app.core.logging import LoggerMixin
 T = TypeVar("T", bound=Document)
 
 
+def to_bson_datetime(value: datetime) -> datetime:
+    """Normalize a datetime to how MongoDB stores and returns it.
+
+    BSON dates are UTC with millisecond precision and come back naive, so
+    in-memory comparisons against stored values must use the same form.
+
+    Args:
+        value: Naive (assumed UTC) or timezone-aware datetime
+
+    Returns:
+        Naive UTC datetime truncated to milliseconds
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond - value.microsecond % 1000)
+
+
 class BaseRepository(Generic[T], LoggerMixin):
     """Base repository providing common CRUD operations for Beanie documents."""
 
@@ -39,6 +57,34 @@ class BaseRepository(Generic[T], LoggerMixin):
             self.logger.error(f"Failed to create {self.model.__name__}: {str(e)}")
             raise DatabaseException(f"Failed to create document: {str(e)}")
 
+    async def create_many(self, data_list: List[dict]) -> List[T]:
+        """Create several documents with a single bulk insert.
+
+        Args:
+            data_list: List of document data dictionaries
+
+        Returns:
+            Created document instances, with their IDs set
+
+        Raises:
+            DatabaseException: If creation fails
+        """
+        if not data_list:
+            return []
+
+        try:
+            documents = [self.model(**data) for data in data_list]
+            # IDs are assigned client-side, so inserted_ids follows input order
+            # even though the server may apply unordered writes in any order
+            result = await self.model.insert_many(documents, ordered=False)
+            for document, inserted_id in zip(documents, result.inserted_ids):
+                document.id = inserted_id
+            self.logger.info(f"Created {len(documents)} {self.model.__name__} documents")
+            return documents
+        except Exception as e:
+            self.logger.error(f"Failed to create {self.model.__name__} documents: {str(e)}")
+            raise DatabaseException(f"Failed to create documents: {str(e)}")
+
     async def get_by_id(self, document_id: str) -> Optional[T]:
         """Get a document by its ID.
 
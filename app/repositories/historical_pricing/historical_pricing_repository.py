@@ -1,10 +1,14 @@
 """Historical pricing repository for MongoDB Time Series Collection operations."""
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Type, Set
 from datetime import datetime
+from pydantic import BaseModel
 from app.models.historical_pricing import HistoricalPricing
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, to_bson_datetime
 from app.core.exceptions import DatabaseException
 
+# Documents fetched per cursor round-trip when streaming
+STREAM_BATCH_SIZE = 1_000
+
 
 class HistoricalPricingRepository(BaseRepository[HistoricalPricing]):
     """Repository for HistoricalPricing time series data."""
@@ -16,36 +20,84 @@ class HistoricalPricingRepository(BaseRepository[HistoricalPricing]):
         self,
         variant_db_id: str,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> List[HistoricalPricing]:
+        end_date: Optional[datetime] = None,
+        projection_model: Optional[Type[BaseModel]] = None
+    ) -> List[Any]:
         """Get historical pricing for a variant, optionally filtered by date range.
 
         Args:
             variant_db_id: MongoDB ID of the variant
             start_date: Optional start date filter
             end_date: Optional end date filter
+            projection_model: Optional model naming the fields to load;
+                full documents are returned when omitted
 
         Returns:
-            List of HistoricalPricing documents
+            List of HistoricalPricing documents, or projection_model instances
 
         Raises:
             DatabaseException: If query fails
         """
         try:
-            query: dict = {"variant_db_id": variant_db_id}
-            if start_date or end_date:
-                date_condition: dict = {}
-                if start_date:
-                    date_condition["$gte"] = start_date
-                if end_date:
-                    date_condition["$lte"] = end_date
-                query["date"] = date_condition
-
-            return await HistoricalPricing.find(query).to_list()
+            query = self._variant_query(variant_db_id, start_date, end_date)
+            return await HistoricalPricing.find(query, projection_model=projection_model).to_list()
         except Exception as e:
             self.logger.error(f"Failed to fetch historical pricing: {e}")
             raise DatabaseException(f"Failed to fetch historical pricing: {e}")
 
+    async def iter_by_variant_db_id(
+        self,
+        variant_db_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        projection_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[Any]:
+        """Stream historical pricing for a variant instead of loading them into a list.
+
+        The cursor pulls documents from the server in batches of
+        STREAM_BATCH_SIZE, so callers that only aggregate over the result
+        hold one batch in memory at a time.
+
+        Args:
+            variant_db_id: MongoDB ID of the variant
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            projection_model: Optional model naming the fields to load;
+                full documents are yielded when omitted
+
+        Yields:
+            HistoricalPricing documents, or projection_model instances
+
+        Raises:
+            DatabaseException: If query fails
+        """
+        query = self._variant_query(variant_db_id, start_date, end_date)
+        try:
+            async for doc in HistoricalPricing.find(
+                query, projection_model=projection_model, batch_size=STREAM_BATCH_SIZE
+            ):
+                yield doc
+        except Exception as e:
+            self.logger.error(f"Failed to stream historical pricing: {e}")
+            raise DatabaseException(f"Failed to stream historical pricing: {e}")
+
+    @staticmethod
+    def _variant_query(
+        variant_db_id: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> dict:
+        """Build the filter for a variant's points within an optional date range."""
+        query: dict = {"variant_db_id": variant_db_id}
+        if start_date or end_date:
+            date_condition: dict = {}
+            if start_date:
+                date_condition["$gte"] = start_date
+            if end_date:
+                date_condition["$lte"] = end_date
+            query["date"] = date_condition
+        return query
+
     async def pricing_exists(
         self,
         variant_db_id: str,
@@ -73,26 +125,91 @@ class HistoricalPricingRepository(BaseRepository[HistoricalPricing]):
             self.logger.error(f"Failed to check pricing existence: {e}")
             raise DatabaseException(f"Failed to check pricing existence: {e}")
 
-    async def bulk_create(self, pricing_data: List[dict]) -> List[HistoricalPricing]:
+    async def get_existing_dates(
+        self,
+        variant_db_id: str,
+        since: Optional[datetime] = None
+    ) -> Set[datetime]:
+        """Get the dates of stored pricing data points for a variant.
+
+        Lets callers deduplicate a whole batch with one query instead of
+        calling pricing_exists per data point. Dates are naive UTC with
+        millisecond precision; compare using to_bson_datetime.
+
+        Args:
+            variant_db_id: MongoDB ID of the variant
+            since: Optional lower bound on date
+
+        Returns:
+            Set of stored data point dates
+
+        Raises:
+            DatabaseException: If query fails
+        """
+        try:
+            query: dict = {"variant_db_id": variant_db_id}
+            if since:
+                query["date"] = {"$gte": to_bson_datetime(since)}
+
+            cursor = HistoricalPricing.get_motor_collection().find(
+                query, {"date": 1, "_id": 0}
+            )
+            return {doc["date"] async for doc in cursor}
+        except Exception as e:
+            self.logger.error(f"Failed to fetch existing pricing dates: {e}")
+            raise DatabaseException(f"Failed to fetch existing pricing dates: {e}")
+
+    async def get_latest_date(self, variant_db_id: str) -> Optional[datetime]:
+        """Get the most recent pricing data point date for a variant.
+
+        Sorts on the time field server-side and returns a single projected
+        document rather than loading the variant's full history.
+
+        Args:
+            variant_db_id: MongoDB ID of the variant
+
+        Returns:
+            Latest date, or None if the variant has no data
+
+        Raises:
+            DatabaseException: If query fails
+        """
+        try:
+            doc = await HistoricalPricing.get_motor_collection().find_one(
+                {"variant_db_id": variant_db_id},
+                {"date": 1, "_id": 0},
+                sort=[("date", -1)]
+            )
+            return doc["date"] if doc else None
+        except Exception as e:
+            self.logger.error(f"Failed to fetch latest pricing date: {e}")
+            raise DatabaseException(f"Failed to fetch latest pricing date: {e}")
+
+    async def bulk_create(self, pricing_data: List[dict]) -> int:
         """Bulk insert historical pricing (optimized for time series).
 
+        Documents are written straight through the driver without building
+        HistoricalPricing models, so each dict must already contain every
+        field of the document in its stored form.
+
         Args:
-            pricing_data: List of dictionaries containing pricing data
+            pricing_data: List of complete pricing documents as dictionaries
 
         Returns:
-            List of created HistoricalPricing documents
+            Number of inserted documents
 
         Raises:
             DatabaseException: If bulk insert fails
         """
         try:
             if not pricing_data:
-                return []
+                return 0
 
-            pricing_records = [HistoricalPricing(**data) for data in pricing_data]
-            await HistoricalPricing.insert_many(pricing_records)
-            self.logger.info(f"Bulk created {len(pricing_records)} historical pricing records")
-            return pricing_records
+            # Unordered lets the server batch the writes without per-document sequencing
+            result = await HistoricalPricing.get_motor_collection().insert_many(pricing_data, ordered=False)
+            inserted = len(result.inserted_ids)
+            self.logger.info(f"Bulk created {inserted} historical pricing records")
+            return inserted
         except Exception as e:
             self.logger.error(f"Failed to bulk create historical pricing: {e}")
             raise DatabaseException(f"Failed to bulk create historical pricing: {e}")
@@ -1,9 +1,20 @@
 """Product repository for database operations."""
-from typing import Optional
+from typing import List, Optional, Tuple
 from app.repositories.base import BaseRepository
+from app.core.cache import TTLCache
 from app.models.product import Product
+from app.models.variant import Variant
+from app.core.exceptions import DatabaseException
 from app.core.logging import LoggerMixin
 
+# Bounds for the product_id lookup cache; only found documents are cached.
+# Documents go in and come out as deep copies, so a caller mutating (or
+# failing to save) its document never changes what others are served.
+# update/delete invalidate this worker only; other workers may serve a
+# stale document for up to LOOKUP_CACHE_TTL_SECONDS.
+LOOKUP_CACHE_MAXSIZE = 10_000
+LOOKUP_CACHE_TTL_SECONDS = 60.0
+
 
 class ProductRepository(BaseRepository[Product], LoggerMixin):
     """Repository for Product document operations."""
@@ -11,6 +22,7 @@ class ProductRepository(BaseRepository[Product], LoggerMixin):
     def __init__(self):
         """Initialize product repository."""
         super().__init__(Product)
+        self._lookup_cache: TTLCache[Product] = TTLCache(LOOKUP_CACHE_MAXSIZE, LOOKUP_CACHE_TTL_SECONDS)
 
     async def get_by_product_id(self, product_id: str) -> Optional[Product]:
         """
@@ -22,7 +34,90 @@ class ProductRepository(BaseRepository[Product], LoggerMixin):
         Returns:
             Product document or None if not found
         """
-        return await self.get_by_field("product_id", product_id)
+        cached = self._lookup_cache.get(product_id)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        document = await self.get_by_field("product_id", product_id)
+        if document is not None:
+            self._lookup_cache.set(product_id, document.model_copy(deep=True))
+        return document
+
+    async def create_if_absent(self, data: dict) -> Optional[Product]:
+        """
+        Insert a product unless one with the same product ID already exists.
+
+        The check and the insert are a single upsert, so concurrent creates
+        of the same product cannot both succeed.
+
+        Args:
+            data: Dictionary of product data
+
+        Returns:
+            Created product document, or None if the product already existed
+
+        Raises:
+            DatabaseException: If the write fails
+        """
+        try:
+            document = self.model(**data)
+            result = await self.model.get_motor_collection().update_one(
+                {"product_id": document.product_id},
+                {"$setOnInsert": document.model_dump(exclude={"id", "revision_id"})},
+                upsert=True
+            )
+            if result.upserted_id is None:
+                return None
+
+            document.id = result.upserted_id
+            self._lookup_cache.set(document.product_id, document.model_copy(deep=True))
+            self.logger.info(f"Created Product with id: {document.id}")
+            return document
+        except Exception as e:
+            self.logger.error(f"Failed to create Product: {str(e)}")
+            raise DatabaseException(f"Failed to create document: {str(e)}")
+
+    async def get_all_with_variants(
+        self,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Tuple[Product, List[Variant]]]:
+        """
+        Get a page of products joined with their variants in one query.
+
+        Variants are attached server-side with $lookup on product_id, so the
+        page costs one round-trip regardless of how many products it holds.
+
+        Args:
+            skip: Number of products to skip
+            limit: Maximum number of products to return
+
+        Returns:
+            List of (product document, variant documents) tuples
+
+        Raises:
+            DatabaseException: If the query fails
+        """
+        pipeline = [
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$lookup": {
+                "from": Variant.get_motor_collection().name,
+                "localField": "product_id",
+                "foreignField": "product_id",
+                "as": "variants"
+            }}
+        ]
+        try:
+            docs = await self.model.get_motor_collection().aggregate(pipeline).to_list(length=None)
+            products_with_variants = []
+            for doc in docs:
+                variants = [Variant.model_validate(variant) for variant in doc.pop("variants")]
+                products_with_variants.append((self.model.model_validate(doc), variants))
+            return products_with_variants
+        except Exception as e:
+            self.logger.error(f"Error fetching products with variants: {str(e)}")
+            raise DatabaseException(f"Failed to fetch products with variants: {str(e)}")
 
     async def get_by_style_id(self, style_id: str) -> Optional[Product]:
         """
@@ -40,14 +135,40 @@ class ProductRepository(BaseRepository[Product], LoggerMixin):
         """
         Check if a product exists by product ID.
 
+        Fetches only the _id instead of decoding the full document.
+
         Args:
             product_id: StockX product UUID
 
         Returns:
             True if product exists, False otherwise
+
+        Raises:
+            DatabaseException: If the query fails
         """
-        product = await self.get_by_product_id(product_id)
-        return product is not None
+        if product_id in self._lookup_cache:
+            return True
+
+        try:
+            document = await self.model.get_motor_collection().find_one(
+                {"product_id": product_id}, {"_id": 1}
+            )
+            return document is not None
+        except Exception as e:
+            self.logger.error(f"Error checking product {product_id} existence: {str(e)}")
+            raise DatabaseException(f"Failed to check product existence: {str(e)}")
+
+    async def update(self, document_id: str, data: dict) -> Optional[Product]:
+        """Update a product and drop cached lookups, since product_id itself may change."""
+        document = await super().update(document_id, data)
+        self._lookup_cache.clear()
+        return document
+
+    async def delete(self, document_id: str) -> bool:
+        """Delete a product and drop cached lookups."""
+        deleted = await super().delete(document_id)
+        self._lookup_cache.clear()
+        return deleted
 
 
 # Singleton instance
@@ -1,10 +1,14 @@
 """Sale repository for MongoDB Time Series Collection operations."""
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Type, Set, Tuple
 from datetime import datetime
+from pydantic import BaseModel
 from app.models.sale import Sale
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, to_bson_datetime
 from app.core.exceptions import DatabaseException
 
+# Documents fetched per cursor round-trip when streaming
+STREAM_BATCH_SIZE = 1_000
+
 
 class SaleRepository(BaseRepository[Sale]):
     """Repository for Sale time series data."""
@@ -16,36 +20,84 @@ class SaleRepository(BaseRepository[Sale]):
         self,
         variant_db_id: str,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> List[Sale]:
+        end_date: Optional[datetime] = None,
+        projection_model: Optional[Type[BaseModel]] = None
+    ) -> List[Any]:
         """Get sales for a variant, optionally filtered by date range.
 
         Args:
             variant_db_id: MongoDB ID of the variant
             start_date: Optional start date filter
             end_date: Optional end date filter
+            projection_model: Optional model naming the fields to load;
+                full documents are returned when omitted
 
         Returns:
-            List of Sale documents
+            List of Sale documents, or projection_model instances
 
         Raises:
             DatabaseException: If query fails
         """
         try:
-            query: dict = {"variant_db_id": variant_db_id}
-            if start_date or end_date:
-                date_condition: dict = {}
-                if start_date:
-                    date_condition["$gte"] = start_date
-                if end_date:
-                    date_condition["$lte"] = end_date
-                query["sale_date"] = date_condition  # type: ignore
-
-            return await Sale.find(query).to_list()
+            query = self._variant_query(variant_db_id, start_date, end_date)
+            return await Sale.find(query, projection_model=projection_model).to_list()
         except Exception as e:
             self.logger.error(f"Failed to fetch sales: {e}")
             raise DatabaseException(f"Failed to fetch sales: {e}")
 
+    async def iter_by_variant_db_id(
+        self,
+        variant_db_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        projection_model: Optional[Type[BaseModel]] = None
+    ) -> AsyncIterator[Any]:
+        """Stream sales for a variant instead of loading them into a list.
+
+        The cursor pulls documents from the server in batches of
+        STREAM_BATCH_SIZE, so callers that only aggregate over the result
+        hold one batch in memory at a time.
+
+        Args:
+            variant_db_id: MongoDB ID of the variant
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            projection_model: Optional model naming the fields to load;
+                full documents are yielded when omitted
+
+        Yields:
+            Sale documents, or projection_model instances
+
+        Raises:
+            DatabaseException: If query fails
+        """
+        query = self._variant_query(variant_db_id, start_date, end_date)
+        try:
+            async for doc in Sale.find(
+                query, projection_model=projection_model, batch_size=STREAM_BATCH_SIZE
+            ):
+                yield doc
+        except Exception as e:
+            self.logger.error(f"Failed to stream sales: {e}")
+            raise DatabaseException(f"Failed to stream sales: {e}")
+
+    @staticmethod
+    def _variant_query(
+        variant_db_id: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> dict:
+        """Build the filter for a variant's points within an optional date range."""
+        query: dict = {"variant_db_id": variant_db_id}
+        if start_date or end_date:
+            date_condition: dict = {}
+            if start_date:
+                date_condition["$gte"] = start_date
+            if end_date:
+                date_condition["$lte"] = end_date
+            query["sale_date"] = date_condition
+        return query
+
     async def sale_exists(
         self,
         variant_db_id: str,
@@ -76,26 +128,91 @@ class SaleRepository(BaseRepository[Sale]):
             self.logger.error(f"Failed to check sale existence: {e}")
             raise DatabaseException(f"Failed to check sale existence: {e}")
 
-    async def bulk_create(self, sales_data: List[dict]) -> List[Sale]:
+    async def get_existing_keys(
+        self,
+        variant_db_id: str,
+        since: Optional[datetime] = None
+    ) -> Set[Tuple[datetime, float]]:
+        """Get the (sale_date, amount) keys of stored sales for a variant.
+
+        Lets callers deduplicate a whole batch with one query instead of
+        calling sale_exists per sale. Dates are naive UTC with millisecond
+        precision; compare using to_bson_datetime.
+
+        Args:
+            variant_db_id: MongoDB ID of the variant
+            since: Optional lower bound on sale_date
+
+        Returns:
+            Set of (sale_date, amount) tuples
+
+        Raises:
+            DatabaseException: If query fails
+        """
+        try:
+            query: dict = {"variant_db_id": variant_db_id}
+            if since:
+                query["sale_date"] = {"$gte": to_bson_datetime(since)}
+
+            cursor = Sale.get_motor_collection().find(
+                query, {"sale_date": 1, "amount": 1, "_id": 0}
+            )
+            return {(doc["sale_date"], doc["amount"]) async for doc in cursor}
+        except Exception as e:
+            self.logger.error(f"Failed to fetch existing sale keys: {e}")
+            raise DatabaseException(f"Failed to fetch existing sale keys: {e}")
+
+    async def get_latest_date(self, variant_db_id: str) -> Optional[datetime]:
+        """Get the most recent sale date for a variant.
+
+        Sorts on the time field server-side and returns a single projected
+        document rather than loading the variant's full history.
+
+        Args:
+            variant_db_id: MongoDB ID of the variant
+
+        Returns:
+            Latest sale_date, or None if the variant has no data
+
+        Raises:
+            DatabaseException: If query fails
+        """
+        try:
+            doc = await Sale.get_motor_collection().find_one(
+                {"variant_db_id": variant_db_id},
+                {"sale_date": 1, "_id": 0},
+                sort=[("sale_date", -1)]
+            )
+            return doc["sale_date"] if doc else None
+        except Exception as e:
+            self.logger.error(f"Failed to fetch latest sale date: {e}")
+            raise DatabaseException(f"Failed to fetch latest sale date: {e}")
+
+    async def bulk_create(self, sales_data: List[dict]) -> int:
         """Bulk insert sales (optimized for time series).
 
+        Documents are written straight through the driver without building
+        Sale models, so each dict must already contain every field of
+        the document in its stored form.
+
         Args:
-            sales_data: List of dictionaries containing sale data
+            sales_data: List of complete sale documents as dictionaries
 
         Returns:
-            List of created Sale documents
+            Number of inserted documents
 
         Raises:
             DatabaseException: If bulk insert fails
         """
         try:
             if not sales_data:
-                return []
+                return 0
 
-            sales = [Sale(**data) for data in sales_data]
-            await Sale.insert_many(sales)
-            self.logger.info(f"Bulk created {len(sales)} sales")
-            return sales
+            # Unordered lets the server batch the writes without per-document sequencing
+            result = await Sale.get_motor_collection().insert_many(sales_data, ordered=False)
+            inserted = len(result.inserted_ids)
+            self.logger.info(f"Bulk created {inserted} sales")
+            return inserted
         except Exception as e:
             self.logger.error(f"Failed to bulk create sales: {e}")
             raise DatabaseException(f"Failed to bulk create sales: {e}")
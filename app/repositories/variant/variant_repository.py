@@ -1,9 +1,19 @@
 """Variant repository for database operations."""
-from typing import Optional, List
+from typing import Dict, Optional, List
 from app.repositories.base import BaseRepository
+from app.core.cache import TTLCache
 from app.models.variant import Variant
+from app.core.exceptions import DatabaseException
 from app.core.logging import LoggerMixin
 
+# Bounds for the variant_id lookup cache; only found documents are cached.
+# Documents go in and come out as deep copies, so a caller mutating (or
+# failing to save) its document never changes what others are served.
+# update/delete invalidate this worker only; other workers may serve a
+# stale document for up to LOOKUP_CACHE_TTL_SECONDS.
+LOOKUP_CACHE_MAXSIZE = 10_000
+LOOKUP_CACHE_TTL_SECONDS = 60.0
+
 
 class VariantRepository(BaseRepository[Variant], LoggerMixin):
     """Repository for Variant document operations."""
@@ -11,6 +21,58 @@ class VariantRepository(BaseRepository[Variant], LoggerMixin):
     def __init__(self):
         """Initialize variant repository."""
         super().__init__(Variant)
+        self._lookup_cache: TTLCache[Variant] = TTLCache(LOOKUP_CACHE_MAXSIZE, LOOKUP_CACHE_TTL_SECONDS)
+
+    async def create(self, data: dict) -> Variant:
+        """
+        Create a variant and remember it for lookups by variant ID.
+
+        The returned document keeps the product it was created with as its
+        resolved link, so caching it spares later readers a link fetch.
+
+        Args:
+            data: Dictionary of variant data
+
+        Returns:
+            Created variant document
+        """
+        document = await super().create(data)
+        self._lookup_cache.set(document.variant_id, document.model_copy(deep=True))
+        return document
+
+    async def create_many(self, data_list: List[dict]) -> List[Variant]:
+        """
+        Bulk create variants and remember them for lookups by variant ID.
+
+        Args:
+            data_list: List of variant data dictionaries
+
+        Returns:
+            Created variant documents
+        """
+        documents = await super().create_many(data_list)
+        for document in documents:
+            self._lookup_cache.set(document.variant_id, document.model_copy(deep=True))
+        return documents
+
+    async def get_by_id_with_product(self, document_id: str) -> Optional[Variant]:
+        """
+        Get a variant by MongoDB ID with its product link already resolved.
+
+        The product is joined server-side with $lookup, so the pair is loaded
+        in one round-trip instead of a get followed by fetch_link.
+
+        Args:
+            document_id: Variant document ID
+
+        Returns:
+            Variant document with product populated, or None if not found
+        """
+        try:
+            return await self.model.get(document_id, fetch_links=True)
+        except Exception as e:
+            self.logger.error(f"Error fetching variant {document_id} with product: {str(e)}")
+            return None
 
     async def get_by_variant_id(self, variant_id: str) -> Optional[Variant]:
         """
@@ -22,7 +84,14 @@ class VariantRepository(BaseRepository[Variant], LoggerMixin):
         Returns:
             Variant document or None if not found
         """
-        return await self.get_by_field("variant_id", variant_id)
+        cached = self._lookup_cache.get(variant_id)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        document = await self.get_by_field("variant_id", variant_id)
+        if document is not None:
+            self._lookup_cache.set(variant_id, document.model_copy(deep=True))
+        return document
 
     async def get_by_product_id(self, product_id: str) -> List[Variant]:
         """
@@ -40,6 +109,37 @@ class VariantRepository(BaseRepository[Variant], LoggerMixin):
             self.logger.error(f"Error fetching variants for product {product_id}: {str(e)}")
             return []
 
+    async def get_by_variant_ids(self, variant_ids: List[str]) -> Dict[str, Variant]:
+        """
+        Get the stored variants among the given variant IDs.
+
+        Resolves all IDs in a single query instead of one lookup per variant,
+        and returns the documents so callers can reuse them without re-querying.
+
+        Args:
+            variant_ids: StockX variant UUIDs to look up
+
+        Returns:
+            Mapping of variant ID to document for the variants that exist
+
+        Raises:
+            DatabaseException: If the query fails
+        """
+        if not variant_ids:
+            return {}
+
+        try:
+            documents = await self.model.find(
+                {"variant_id": {"$in": list(variant_ids)}}
+            ).to_list()
+        except Exception as e:
+            self.logger.error(f"Error fetching variants by IDs: {str(e)}")
+            raise DatabaseException(f"Failed to fetch variants by IDs: {str(e)}")
+
+        for document in documents:
+            self._lookup_cache.set(document.variant_id, document.model_copy(deep=True))
+        return {document.variant_id: document for document in documents}
+
     async def get_by_upc(self, upc: str) -> Optional[Variant]:
         """
         Get a variant by its UPC code.
@@ -56,14 +156,40 @@ class VariantRepository(BaseRepository[Variant], LoggerMixin):
         """
         Check if a variant exists by variant ID.
 
+        Fetches only the _id instead of decoding the full document.
+
         Args:
             variant_id: StockX variant UUID
 
         Returns:
             True if variant exists, False otherwise
+
+        Raises:
+            DatabaseException: If the query fails
         """
-        variant = await self.get_by_variant_id(variant_id)
-        return variant is not None
+        if variant_id in self._lookup_cache:
+            return True
+
+        try:
+            document = await self.model.get_motor_collection().find_one(
+                {"variant_id": variant_id}, {"_id": 1}
+            )
+            return document is not None
+        except Exception as e:
+            self.logger.error(f"Error checking variant {variant_id} existence: {str(e)}")
+            raise DatabaseException(f"Failed to check variant existence: {str(e)}")
+
+    async def update(self, document_id: str, data: dict) -> Optional[Variant]:
+        """Update a variant and drop cached lookups, since variant_id itself may change."""
+        document = await super().update(document_id, data)
+        self._lookup_cache.clear()
+        return document
+
+    async def delete(self, document_id: str) -> bool:
+        """Delete a variant and drop cached lookups."""
+        deleted = await super().delete(document_id)
+        self._lookup_cache.clear()
+        return deleted
 
 
 # Singleton instance
@@ -2,12 +2,37 @@
 External StockX Market Data API Client.
 Handles requests to the external StockX data API for market data like sales, bids, asks.
 """
+import asyncio
+import collections
+import random
+import time
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Any, Hashable, Optional
+from app.core.cache import SingleFlight, TTLCache
 from app.core.logging import LoggerMixin
 from app.core.exceptions import APIClientException
 from app.core.config import settings
 
+# AIMD tuning: additive increase per healthy response, multiplicative decrease on overload
+AIMD_INCREASE_STEP = 0.5
+AIMD_DECREASE_FACTOR = 0.5
+
+# Sliding window length for the requests-per-minute budget
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+# Pause proactively once less than this fraction of the server's quota remains
+RATE_LIMIT_LOW_WATERMARK = 0.1
+
+# Retry policy for transient failures (429, 5xx, network errors)
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE_SECONDS = 0.5
+RETRY_JITTER_SECONDS = 0.25
+
+# Upper bound on cached market data responses
+RESPONSE_CACHE_MAXSIZE = 10_000
+
 
 class ExternalStockXClient(LoggerMixin):
     """
@@ -23,6 +48,26 @@ class ExternalStockXClient(LoggerMixin):
         self.bearer_token = settings.external_stockx_api_token
         self.timeout = 30.0
 
+        # Adaptive concurrency (AIMD) state
+        self._concurrency = float(settings.external_stockx_initial_concurrency)
+        self._max_concurrency = float(settings.external_stockx_max_concurrency)
+        self._target_latency = settings.external_stockx_target_latency_seconds
+        self._in_flight = 0
+        self._slot_available = asyncio.Condition()
+        self._latencies: Deque[float] = collections.deque(maxlen=32)
+
+        # Sliding-window rate limit state
+        self._rate_limit_rpm = settings.external_stockx_rate_limit_rpm
+        self._rpm_window: Deque[float] = collections.deque()
+        self._paused_until = 0.0
+
+        # Short-lived cache of market data responses
+        self._response_cache: TTLCache[Dict[str, Any]] = TTLCache(
+            maxsize=RESPONSE_CACHE_MAXSIZE,
+            ttl=settings.external_stockx_cache_ttl_seconds
+        )
+        self._single_flight: SingleFlight[Dict[str, Any]] = SingleFlight()
+
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
         return {
@@ -30,6 +75,146 @@ class ExternalStockXClient(LoggerMixin):
             "Content-Type": "application/json"
         }
 
+    async def _wait_if_throttled(self) -> None:
+        """
+        Block until a request fits in the sliding-window RPM budget.
+
+        Also honours any pause requested by the server via rate-limit headers.
+        """
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            # Drop timestamps that have left the window
+            window = self._rpm_window
+            while window and now - window[0] >= RATE_LIMIT_WINDOW_SECONDS:
+                window.popleft()
+
+            if len(window) < self._rate_limit_rpm:
+                window.append(now)
+                return
+
+            await asyncio.sleep(RATE_LIMIT_WINDOW_SECONDS - (now - window[0]))
+
+    @asynccontextmanager
+    async def _concurrency_slot(self) -> AsyncIterator[None]:
+        """Hold one of the in-flight slots allowed by the current AIMD limit."""
+        async with self._slot_available:
+            await self._slot_available.wait_for(
+                lambda: self._in_flight < max(1, int(self._concurrency))
+            )
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slot_available:
+                self._in_flight -= 1
+                self._slot_available.notify_all()
+
+    def _pause_for(self, seconds: float) -> None:
+        """Stop issuing new requests for the given number of seconds."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _record_response(self, response: httpx.Response, latency: float) -> None:
+        """
+        Adjust the concurrency limit and rate-limit pause from a response.
+
+        Args:
+            response: Response returned by the external API
+            latency: Round-trip time of the request in seconds
+        """
+        status_code = response.status_code
+        headers = response.headers
+
+        if _is_transient(status_code):
+            # Multiplicative decrease on overload
+            self._concurrency = max(1.0, self._concurrency * AIMD_DECREASE_FACTOR)
+            retry_after = _parse_seconds(headers.get("retry-after"))
+            if retry_after:
+                self._pause_for(retry_after)
+            self.logger.warning(
+                f"External API overloaded (status {status_code}), "
+                f"concurrency reduced to {self._concurrency:.1f}"
+            )
+            return
+
+        # Additive increase while latency stays within target
+        self._latencies.append(latency)
+        if sum(self._latencies) / len(self._latencies) <= self._target_latency:
+            self._concurrency = min(self._max_concurrency, self._concurrency + AIMD_INCREASE_STEP)
+
+        # Proactively back off when the server's quota is nearly exhausted
+        remaining = _parse_seconds(headers.get("x-ratelimit-remaining"))
+        limit = _parse_seconds(headers.get("x-ratelimit-limit"))
+        if remaining is not None and limit and remaining < limit * RATE_LIMIT_LOW_WATERMARK:
+            reset = _parse_seconds(headers.get("x-ratelimit-reset")) or 1.0
+            self.logger.info(f"External API quota low ({remaining:.0f}/{limit:.0f}), pausing {reset:.1f}s")
+            self._pause_for(reset)
+
+    async def _cached(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Return a cached response for key, calling fetch on a miss.
+
+        Concurrent misses for the same key share a single upstream request.
+
+        Args:
+            key: Cache key identifying the request
+            fetch: Zero-argument coroutine function performing the request
+
+        Returns:
+            Response data dictionary
+        """
+        data = self._response_cache.get(key)
+        if data is not None:
+            self.logger.debug(f"Cache hit for {key}")
+            return data
+
+        data = await self._single_flight.run(key, fetch)
+        self._response_cache.set(key, data)
+        return data
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json: Dict[str, Any]
+    ) -> httpx.Response:
+        """
+        Send a single request within the rate-limit and concurrency budget.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            headers: Request headers
+            json: JSON payload for request body
+
+        Returns:
+            Raw HTTP response
+        """
+        await self._wait_if_throttled()
+
+        async with self._concurrency_slot():
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                self.logger.info(f"Making {method} request to {url}")
+
+                started = time.monotonic()
+                response = await client.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    json=json
+                )
+                self._record_response(response, time.monotonic() - started)
+
+        return response
+
     async def _make_request(
         self,
         method: str,
@@ -39,6 +224,10 @@ class ExternalStockXClient(LoggerMixin):
         """
         Make HTTP request to external API.
 
+        Transient failures (429, 5xx and network errors) are retried with
+        exponential backoff and jitter; any Retry-After pause is applied by
+        the rate limiter before the next attempt.
+
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
@@ -54,24 +243,33 @@ class ExternalStockXClient(LoggerMixin):
         headers = self._get_headers()
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                self.logger.info(f"Making {method} request to {url}")
-
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=json
+            for attempt in range(MAX_RETRIES + 1):
+                try:
+                    response = await self._send(method, url, headers, json)
+                except httpx.RequestError as e:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    reason = str(e) or e.__class__.__name__
+                else:
+                    if not _is_transient(response.status_code) or attempt == MAX_RETRIES:
+                        break
+                    reason = f"status {response.status_code}"
+
+                delay = _backoff_delay(attempt)
+                self.logger.warning(
+                    f"Transient failure on {method} {url} ({reason}), "
+                    f"retry {attempt + 1}/{MAX_RETRIES} in {delay:.2f}s"
                 )
+                await asyncio.sleep(delay)
 
-                if response.status_code != 200:
-                    error_msg = f"API request failed with status {response.status_code}: {response.text}"
-                    self.logger.error(error_msg)
-                    raise APIClientException(error_msg)
+            if response.status_code != 200:
+                error_msg = f"API request failed with status {response.status_code}: {response.text}"
+                self.logger.error(error_msg)
+                raise APIClientException(error_msg)
 
-                data = response.json()
-                self.logger.info(f"Successfully fetched data from {endpoint}")
-                return data
+            data = orjson.loads(response.content)
+            self.logger.info(f"Successfully fetched data from {endpoint}")
+            return data
 
         except httpx.TimeoutException as e:
             error_msg = f"Request timeout: {e}"
@@ -113,7 +311,10 @@ class ExternalStockXClient(LoggerMixin):
         }
 
         endpoint = "/api/stockx-clean/market-data"
-        data = await self._make_request("POST", endpoint, json=payload)
+        data = await self._cached(
+            ("sales", product_id, is_variant),
+            lambda: self._make_request("POST", endpoint, json=payload)
+        )
 
         return data
 
@@ -144,7 +345,10 @@ class ExternalStockXClient(LoggerMixin):
         }
 
         endpoint = "/api/stockx-clean/market-data"
-        data = await self._make_request("POST", endpoint, json=payload)
+        data = await self._cached(
+            ("bid", product_id, is_variant),
+            lambda: self._make_request("POST", endpoint, json=payload)
+        )
 
         return data
 
@@ -175,7 +379,10 @@ class ExternalStockXClient(LoggerMixin):
         }
 
         endpoint = "/api/stockx-clean/market-data"
-        data = await self._make_request("POST", endpoint, json=payload)
+        data = await self._cached(
+            ("ask", product_id, is_variant),
+            lambda: self._make_request("POST", endpoint, json=payload)
+        )
 
         return data
 
@@ -222,10 +429,33 @@ class ExternalStockXClient(LoggerMixin):
             payload["endDate"] = end_date
 
         endpoint = "/api/stockx-clean/market-data"
-        data = await self._make_request("POST", endpoint, json=payload)
+        data = await self._single_flight.run(
+            ("historical", product_id, is_variant, intervals, start_date, end_date),
+            lambda: self._make_request("POST", endpoint, json=payload)
+        )
 
         return data
 
 
+def _is_transient(status_code: int) -> bool:
+    """Whether a response status is worth retrying."""
+    return status_code == 429 or status_code >= 500
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff delay with jitter for the given zero-based attempt."""
+    return RETRY_BACKOFF_BASE_SECONDS * (2 ** attempt) + random.uniform(0, RETRY_JITTER_SECONDS)
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a numeric header value, returning None if absent or malformed."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
 # Singleton instance
 external_stockx_client = ExternalStockXClient()
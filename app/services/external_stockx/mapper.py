@@ -2,14 +2,57 @@
 External StockX API response mapper.
 Transforms raw API responses into domain models.
 """
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
 from app.core.exceptions import APIClientException
+from app.core.logging import get_logger
 from app.domain.external_market_data import Sale, Bid, Ask, HistoricalSale, SaleFactory, BidFactory, AskFactory, HistoricalSaleFactory
 
+logger = get_logger(__name__)
+
+# Full key paths from the response root to the list each mapper consumes
+SALES_EDGES_PATH = ('data', 'data', 'variant', 'market', 'sales', 'edges')
+PRICE_LEVEL_EDGES_PATH = ('data', 'data', 'variant', 'market', 'priceLevels', 'edges')
+SALES_CHART_SERIES_PATH = ('data', 'data', 'variant', 'salesChart', 'series')
+
+
+def _walk(data: Any, path: Tuple[str, ...]) -> Any:
+    """
+    Follow a key path through nested dicts.
+
+    Args:
+        data: Parsed response (or any nested value)
+        path: Keys to follow, outermost first
+
+    Returns:
+        The value at the end of the path, or None if any hop is missing
+        or not a dict
+    """
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
 
 class ExternalStockXMapper:
     """Maps external StockX API responses to domain models."""
 
+    @staticmethod
+    def item_count(api_response: Dict[str, Any], path: Tuple[str, ...]) -> int:
+        """
+        Count the items a mapper would process, without transforming them.
+
+        Args:
+            api_response: Raw API response
+            path: Key path to the list of edges or series points
+
+        Returns:
+            Number of items, or 0 if the list is missing or malformed
+        """
+        items = _walk(api_response, path)
+        return len(items) if isinstance(items, list) else 0
+
     @staticmethod
     def to_sales(api_response: Dict[str, Any], product_id: str, is_variant: bool) -> List[Sale]:
         """
@@ -27,30 +70,27 @@ class ExternalStockXMapper:
             APIClientException: If response is invalid or missing required fields
         """
         try:
-            # Navigate through the nested response structure
-            data = api_response.get('data', {})
-            inner_data = data.get('data', {})
-            variant = inner_data.get('variant', {})
-            market = variant.get('market', {})
-            sales_data = market.get('sales', {})
-            edges = sales_data.get('edges', [])
+            edges = _walk(api_response, SALES_EDGES_PATH) or []
 
             if not isinstance(edges, list):
                 raise APIClientException("Expected 'edges' to be a list in sales response")
 
-            # Transform each edge node to Sale entity
-            sales = []
+            # Transform each edge node to Sale entity, sharing one fallback timestamp
+            now = datetime.utcnow()
+            build = SaleFactory.from_external_api
+            sales: List[Sale] = []
+            append = sales.append
             for edge in edges:
-                node = edge.get('node')
-                if not node:
+                node = edge.get('node') if isinstance(edge, dict) else None
+                # Skip nodes without a price up front rather than via the factory's ValueError
+                if not node or node.get('amount') is None:
                     continue
 
                 try:
-                    sale = SaleFactory.from_external_api(node, product_id, is_variant)
-                    sales.append(sale)
+                    append(build(node, product_id, is_variant, now))
                 except Exception as e:
                     # Log and skip invalid sales, don't fail the entire request
-                    print(f"Skipping invalid sale: {e}")
+                    logger.debug(f"Skipping invalid sale: {e}")
                     continue
 
             return sales
@@ -77,30 +117,26 @@ class ExternalStockXMapper:
             APIClientException: If response is invalid or missing required fields
         """
         try:
-            # Navigate through the nested response structure
-            data = api_response.get('data', {})
-            inner_data = data.get('data', {})
-            variant = inner_data.get('variant', {})
-            market = variant.get('market', {})
-            price_levels = market.get('priceLevels', {})
-            edges = price_levels.get('edges', [])
+            edges = _walk(api_response, PRICE_LEVEL_EDGES_PATH) or []
 
             if not isinstance(edges, list):
                 raise APIClientException("Expected 'edges' to be a list in bids response")
 
             # Transform each edge node to Bid entity
-            bids = []
+            build = BidFactory.from_external_api
+            bids: List[Bid] = []
+            append = bids.append
             for edge in edges:
-                node = edge.get('node')
-                if not node:
+                node = edge.get('node') if isinstance(edge, dict) else None
+                # Skip nodes without a price up front rather than via the factory's ValueError
+                if not node or node.get('amount') is None:
                     continue
 
                 try:
-                    bid = BidFactory.from_external_api(node, product_id, is_variant)
-                    bids.append(bid)
+                    append(build(node, product_id, is_variant))
                 except Exception as e:
                     # Log and skip invalid bids, don't fail the entire request
-                    print(f"Skipping invalid bid: {e}")
+                    logger.debug(f"Skipping invalid bid: {e}")
                     continue
 
             return bids
@@ -127,30 +163,26 @@ class ExternalStockXMapper:
             APIClientException: If response is invalid or missing required fields
         """
         try:
-            # Navigate through the nested response structure
-            data = api_response.get('data', {})
-            inner_data = data.get('data', {})
-            variant = inner_data.get('variant', {})
-            market = variant.get('market', {})
-            price_levels = market.get('priceLevels', {})
-            edges = price_levels.get('edges', [])
+            edges = _walk(api_response, PRICE_LEVEL_EDGES_PATH) or []
 
             if not isinstance(edges, list):
                 raise APIClientException("Expected 'edges' to be a list in asks response")
 
             # Transform each edge node to Ask entity
-            asks = []
+            build = AskFactory.from_external_api
+            asks: List[Ask] = []
+            append = asks.append
             for edge in edges:
-                node = edge.get('node')
-                if not node:
+                node = edge.get('node') if isinstance(edge, dict) else None
+                # Skip nodes without a price up front rather than via the factory's ValueError
+                if not node or node.get('amount') is None:
                     continue
 
                 try:
-                    ask = AskFactory.from_external_api(node, product_id, is_variant)
-                    asks.append(ask)
+                    append(build(node, product_id, is_variant))
                 except Exception as e:
                     # Log and skip invalid asks, don't fail the entire request
-                    print(f"Skipping invalid ask: {e}")
+                    logger.debug(f"Skipping invalid ask: {e}")
                     continue
 
             return asks
@@ -177,30 +209,35 @@ class ExternalStockXMapper:
             APIClientException: If response is invalid or missing required fields
         """
         try:
-            # Navigate through the nested response structure
-            data = api_response.get('data', {})
-            inner_data = data.get('data', {})
-            variant = inner_data.get('variant', {})
-            sales_chart = variant.get('salesChart', {})
-            series = sales_chart.get('series', [])
+            series = _walk(api_response, SALES_CHART_SERIES_PATH) or []
 
             if not isinstance(series, list):
                 raise APIClientException("Expected 'series' to be a list in historical sales response")
 
-            # Transform each series data point to HistoricalSale entity
-            historical_sales = []
+            # Transform each series data point to HistoricalSale entity.
+            # Series run to hundreds of points, so size the output once and
+            # trim the slots left over by skipped points.
+            build = HistoricalSaleFactory.from_external_api
+            historical_sales: List[HistoricalSale] = [None] * len(series)  # type: ignore[list-item]
+            filled = 0
             for data_point in series:
-                if not data_point:
+                if (
+                    not data_point
+                    or not isinstance(data_point, dict)
+                    or not data_point.get('xValue')
+                    or data_point.get('yValue') is None
+                ):
                     continue
 
                 try:
-                    historical_sale = HistoricalSaleFactory.from_external_api(data_point, product_id, is_variant)
-                    historical_sales.append(historical_sale)
+                    historical_sales[filled] = build(data_point, product_id, is_variant)
+                    filled += 1
                 except Exception as e:
                     # Log and skip invalid data points, don't fail the entire request
-                    print(f"Skipping invalid historical sale data point: {e}")
+                    logger.debug(f"Skipping invalid historical sale data point: {e}")
                     continue
 
+            del historical_sales[filled:]
             return historical_sales
 
         except KeyError as e:
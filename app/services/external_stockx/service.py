@@ -2,14 +2,26 @@
 External StockX Service Wrapper.
 Orchestrates API calls to external service and transforms responses into domain models.
 """
-from typing import List, Optional
+import asyncio
 import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 from app.services.external_stockx.api_client import external_stockx_client
-from app.services.external_stockx.mapper import ExternalStockXMapper
+from app.services.external_stockx.mapper import (
+    ExternalStockXMapper,
+    PRICE_LEVEL_EDGES_PATH,
+    SALES_CHART_SERIES_PATH,
+    SALES_EDGES_PATH,
+)
 from app.core.logging import LoggerMixin
 from app.core.exceptions import APIClientException
 from app.domain.external_market_data import Sale, Bid, Ask, HistoricalSale
 
+T = TypeVar("T")
+
+# Responses with more items than this are mapped in a worker thread
+MAPPER_OFFLOAD_THRESHOLD = 200
+
 
 class ExternalStockXService(LoggerMixin):
     """
@@ -23,6 +35,31 @@ class ExternalStockXService(LoggerMixin):
         self.api_client = external_stockx_client
         self.mapper = ExternalStockXMapper()
 
+    async def _transform(
+        self,
+        transform: Callable[[Dict[str, Any], str, bool], List[T]],
+        api_response: Dict[str, Any],
+        item_count: int,
+        product_id: str,
+        is_variant: bool
+    ) -> List[T]:
+        """
+        Run a mapper transform, off the event loop for large responses.
+
+        Args:
+            transform: Mapper method to apply
+            api_response: Raw API response
+            item_count: Number of items the transform will process
+            product_id: The product or variant ID
+            is_variant: Whether product_id is a variant ID
+
+        Returns:
+            List of domain model instances
+        """
+        if item_count > MAPPER_OFFLOAD_THRESHOLD:
+            return await asyncio.to_thread(transform, api_response, product_id, is_variant)
+        return transform(api_response, product_id, is_variant)
+
     async def get_sales(
         self,
         product_id: str,
@@ -48,7 +85,11 @@ class ExternalStockXService(LoggerMixin):
             api_response = await self.api_client.fetch_sales_data(product_id, is_variant)
 
             # Transform to domain models
-            sales = self.mapper.to_sales(api_response, product_id, is_variant)
+            sales = await self._transform(
+                self.mapper.to_sales, api_response,
+                self.mapper.item_count(api_response, SALES_EDGES_PATH),
+                product_id, is_variant
+            )
 
             self.logger.info(
                 f"Successfully fetched and transformed {len(sales)} sales for {product_id}"
@@ -88,7 +129,11 @@ class ExternalStockXService(LoggerMixin):
             api_response = await self.api_client.fetch_bids_data(product_id, is_variant)
 
             # Transform to domain models
-            bids = self.mapper.to_bids(api_response, product_id, is_variant)
+            bids = await self._transform(
+                self.mapper.to_bids, api_response,
+                self.mapper.item_count(api_response, PRICE_LEVEL_EDGES_PATH),
+                product_id, is_variant
+            )
 
             self.logger.info(
                 f"Successfully fetched and transformed {len(bids)} bids for {product_id}"
@@ -128,7 +173,11 @@ class ExternalStockXService(LoggerMixin):
             api_response = await self.api_client.fetch_asks_data(product_id, is_variant)
 
             # Transform to domain models
-            asks = self.mapper.to_asks(api_response, product_id, is_variant)
+            asks = await self._transform(
+                self.mapper.to_asks, api_response,
+                self.mapper.item_count(api_response, PRICE_LEVEL_EDGES_PATH),
+                product_id, is_variant
+            )
 
             self.logger.info(
                 f"Successfully fetched and transformed {len(asks)} asks for {product_id}"
@@ -177,9 +226,15 @@ class ExternalStockXService(LoggerMixin):
             api_response = await self.api_client.fetch_historical_sales_data(
                 product_id, is_variant, intervals, start_date, end_date
             )
-            self.logger.info(f"API response: {json.dumps(api_response, indent=4)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"API response: {json.dumps(api_response, indent=4)}")
+
             # Transform to domain models
-            historical_sales = self.mapper.to_historical_sales(api_response, product_id, is_variant)
+            historical_sales = await self._transform(
+                self.mapper.to_historical_sales, api_response,
+                self.mapper.item_count(api_response, SALES_CHART_SERIES_PATH),
+                product_id, is_variant
+            )
 
             self.logger.info(
                 f"Successfully fetched and transformed {len(historical_sales)} historical sales for {product_id}"
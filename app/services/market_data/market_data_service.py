@@ -1,14 +1,27 @@
 """Market data service for fetching and storing sales and pricing data."""
-from typing import List, Tuple, Optional, Any
+import asyncio
+from functools import lru_cache
+from typing import Dict, Hashable, List, Tuple, Optional, Any
 from datetime import datetime, timedelta, timezone
 from app.services.external_stockx.service import external_stockx_service
 from app.repositories.variant.variant_repository import variant_repository
 from app.repositories.sale.sale_repository import sale_repository
 from app.repositories.historical_pricing.historical_pricing_repository import historical_pricing_repository
+from app.repositories.base import to_bson_datetime
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.exceptions import DatabaseException, APIClientException
 from app.core.logging import LoggerMixin
 from app.domain.external_market_data.sale import Sale as SaleDomain
 from app.domain.external_market_data.historical_sale import HistoricalSale
+from beanie import Link
+from app.models.sale import SaleSummary
+from app.models.historical_pricing import HistoricalPricingSummary
+
+# Upper bound on variants with cached read results, and on the distinct
+# date ranges cached per variant
+READ_CACHE_MAXSIZE = 1_000
+READ_CACHE_RANGES_PER_VARIANT = 16
 
 
 class MarketDataService(LoggerMixin):
@@ -21,6 +34,32 @@ class MarketDataService(LoggerMixin):
         self.sale_repo = sale_repository
         self.historical_pricing_repo = historical_pricing_repository
 
+        # Short-lived cache of stored-data reads, grouped per variant so a write
+        # can drop them all. Invalidation only reaches this worker; other
+        # workers may serve reads up to market_data_cache_ttl_seconds old.
+        self._read_cache: TTLCache[Dict[Hashable, Tuple[List[Any], Any, Any]]] = TTLCache(
+            maxsize=READ_CACHE_MAXSIZE,
+            ttl=settings.market_data_cache_ttl_seconds
+        )
+
+    def _reads_for(self, variant_db_id: str) -> Dict[Hashable, Tuple[List[Any], Any, Any]]:
+        """
+        Return the cached reads for a variant, creating the entry if needed.
+
+        Callers store their result into the dict they got before reading, so
+        a write that invalidates the variant mid-read orphans that dict and
+        the stale result is never served.
+        """
+        reads = self._read_cache.get(variant_db_id)
+        if reads is None:
+            reads = {}
+            self._read_cache.set(variant_db_id, reads)
+        return reads
+
+    def _invalidate_reads(self, variant_db_id: str) -> None:
+        """Drop every cached read for a variant."""
+        self._read_cache.pop(variant_db_id)
+
     async def _determine_date_range(self, variant_db_id: str) -> Tuple[Optional[str], str]:
         """
         Determine automatic date range based on existing data.
@@ -40,18 +79,14 @@ class MarketDataService(LoggerMixin):
         """
         self.logger.info("Determining automatic date range...")
 
-        # Get latest sale date
-        existing_sales = await self.sale_repo.get_by_variant_db_id(variant_db_id)
-        latest_sale_date = None
-        if existing_sales:
-            latest_sale_date = max(sale.sale_date for sale in existing_sales)
+        # Get latest sale and pricing dates concurrently
+        latest_sale_date, latest_pricing_date = await asyncio.gather(
+            self.sale_repo.get_latest_date(variant_db_id),
+            self.historical_pricing_repo.get_latest_date(variant_db_id)
+        )
+        if latest_sale_date:
             self.logger.info(f"Latest sale date found: {latest_sale_date}")
-
-        # Get latest pricing date
-        existing_pricing = await self.historical_pricing_repo.get_by_variant_db_id(variant_db_id)
-        latest_pricing_date = None
-        if existing_pricing:
-            latest_pricing_date = max(pricing.date for pricing in existing_pricing)
+        if latest_pricing_date:
             self.logger.info(f"Latest pricing date found: {latest_pricing_date}")
 
         # Determine the latest date between sales and pricing
@@ -107,7 +142,7 @@ class MarketDataService(LoggerMixin):
         self.logger.info(f"Fetching market data for variant {variant_db_id}")
 
         # 1. Look up variant by MongoDB ID
-        variant = await self.variant_repo.get_by_id(variant_db_id)
+        variant = await self.variant_repo.get_by_id_with_product(variant_db_id)
         if not variant:
             raise ValueError(f"Variant with ID {variant_db_id} not found")
 
@@ -120,41 +155,56 @@ class MarketDataService(LoggerMixin):
             start_date, end_date = await self._determine_date_range(variant_db_id)
 
         try:
-            # 3. Fetch sales from StockX API
-            self.logger.info(f"Fetching sales for variant {variant_id}")
-            sales_domain = await self.external_stockx_service.get_sales(
-                product_id=variant_id,
-                is_variant=True
+            # 3-4. Fetch sales and historical pricing from StockX API concurrently
+            self.logger.info(f"Fetching sales and historical pricing for variant {variant_id}")
+            sales_domain, pricing_domain = await asyncio.gather(
+                self.external_stockx_service.get_sales(
+                    product_id=variant_id,
+                    is_variant=True
+                ),
+                self.external_stockx_service.get_historical_sales(
+                    product_id=variant_id,
+                    is_variant=True,
+                    intervals=intervals,
+                    start_date=start_date,
+                    end_date=end_date
+                )
             )
-            self.logger.info(f"Fetched {len(sales_domain)} sales from API")
-
-            # 4. Fetch historical pricing from StockX API
-            self.logger.info(f"Fetching historical pricing for variant {variant_id}")
-            pricing_domain = await self.external_stockx_service.get_historical_sales(
-                product_id=variant_id,
-                is_variant=True,
-                intervals=intervals,
-                start_date=start_date,
-                end_date=end_date
+            self.logger.info(
+                f"Fetched {len(sales_domain)} sales and {len(pricing_domain)} pricing records from API"
             )
-            self.logger.info(f"Fetched {len(pricing_domain)} pricing records from API")
 
-            # 5. Filter out existing sales
+            # 5. Load keys of already stored records in the fetched windows
+            # Timestamps may mix aware (parsed "...Z") and naive (fallback) values,
+            # so compare them in their stored form
+            existing_sale_keys, existing_pricing_dates = await asyncio.gather(
+                self.sale_repo.get_existing_keys(
+                    variant_db_id,
+                    since=min(to_bson_datetime(sale.created_at) for sale in sales_domain)
+                ) if sales_domain else _empty_set(),
+                self.historical_pricing_repo.get_existing_dates(
+                    variant_db_id,
+                    since=min(to_bson_datetime(pricing.date) for pricing in pricing_domain)
+                ) if pricing_domain else _empty_set()
+            )
+
+            # 6. Filter out existing sales and historical pricing with set differences
+            # Keying by the stored form also collapses duplicates within the batch
+            sale_candidates = {
+                (to_bson_datetime(sale.created_at), float(sale.amount.amount)): sale
+                for sale in sales_domain
+            }
+            new_sale_keys = sale_candidates.keys() - existing_sale_keys
             new_sales_data = []
             filtered_sales_domain = []
-            for sale in sales_domain:
-                exists = await self.sale_repo.sale_exists(
-                    variant_db_id=variant_db_id,
-                    sale_date=sale.created_at,
-                    amount=float(sale.amount.amount)
-                )
-                if not exists:
+            for key, sale in sale_candidates.items():
+                if key in new_sale_keys:
                     new_sales_data.append({
                         "variant_db_id": variant_db_id,
                         "variant_id": variant_id,
                         "product_id": product_id,
                         "sale_date": sale.created_at,
-                        "amount": float(sale.amount.amount),
+                        "amount": key[1],
                         "currency_code": sale.amount.currency_code,
                         "size": sale.size,
                         "order_type": sale.order_type,
@@ -162,31 +212,37 @@ class MarketDataService(LoggerMixin):
                     })
                     filtered_sales_domain.append(sale)
 
-            # 6. Filter out existing historical pricing
-            new_pricing_data = []
-            filtered_pricing_domain = []
-            for pricing in pricing_domain:
-                exists = await self.historical_pricing_repo.pricing_exists(
-                    variant_db_id=variant_db_id,
-                    date=pricing.date
-                )
-                if not exists:
-                    new_pricing_data.append({
-                        "variant_db_id": variant_db_id,
-                        "variant_id": variant_id,
-                        "product_id": product_id,
-                        "date": pricing.date,
-                        "price": pricing.price,
-                        "is_variant": pricing.is_variant
-                    })
-                    filtered_pricing_domain.append(pricing)
-
-            # 7. Bulk insert new records
-            self.logger.info(f"Inserting {len(new_sales_data)} new sales")
-            await self.sale_repo.bulk_create(new_sales_data)
-
-            self.logger.info(f"Inserting {len(new_pricing_data)} new pricing records")
-            await self.historical_pricing_repo.bulk_create(new_pricing_data)
+            pricing_candidates = {
+                to_bson_datetime(pricing.date): pricing for pricing in pricing_domain
+            }
+            new_pricing_dates = pricing_candidates.keys() - existing_pricing_dates
+            filtered_pricing_domain = [
+                pricing for date, pricing in pricing_candidates.items()
+                if date in new_pricing_dates
+            ]
+            new_pricing_data = [
+                {
+                    "variant_db_id": variant_db_id,
+                    "variant_id": variant_id,
+                    "product_id": product_id,
+                    "date": pricing.date,
+                    "price": pricing.price,
+                    "is_variant": pricing.is_variant
+                }
+                for pricing in filtered_pricing_domain
+            ]
+
+            # 7. Bulk insert new records into both collections concurrently
+            self.logger.info(
+                f"Inserting {len(new_sales_data)} new sales and "
+                f"{len(new_pricing_data)} new pricing records"
+            )
+            await asyncio.gather(
+                self.sale_repo.bulk_create(new_sales_data),
+                self.historical_pricing_repo.bulk_create(new_pricing_data)
+            )
+            if new_sales_data or new_pricing_data:
+                self._invalidate_reads(variant_db_id)
 
             self.logger.info(
                 f"Successfully stored {len(new_sales_data)} sales and "
@@ -211,6 +267,44 @@ class MarketDataService(LoggerMixin):
             self.logger.error(f"Unexpected error: {e}")
             raise DatabaseException(f"Failed to fetch and store market data: {e}")
 
+    async def fetch_and_store_many(
+        self,
+        variant_db_ids: List[str],
+        intervals: int = 400
+    ) -> Dict[str, Any]:
+        """
+        Fetch and store market data for several variants concurrently.
+
+        At most external_stockx_max_concurrency variants are processed at
+        once; the API client's own limiter paces the requests underneath.
+        One variant failing does not stop the others.
+
+        Args:
+            variant_db_ids: MongoDB IDs of the variants
+            intervals: Number of data points for historical pricing
+
+        Returns:
+            Mapping of variant ID to its fetch_and_store_variant_market_data
+            result, or to the exception it raised
+        """
+        semaphore = asyncio.Semaphore(settings.external_stockx_max_concurrency)
+
+        async def _one(variant_db_id: str):
+            async with semaphore:
+                return await self.fetch_and_store_variant_market_data(
+                    variant_db_id, intervals=intervals
+                )
+
+        results = await asyncio.gather(
+            *(_one(variant_db_id) for variant_db_id in variant_db_ids),
+            return_exceptions=True
+        )
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        self.logger.info(
+            f"Stored market data for {len(results) - failed}/{len(results)} variants"
+        )
+        return dict(zip(variant_db_ids, results))
+
     async def get_sales_by_variant(
         self,
         variant_db_id: str,
@@ -226,7 +320,7 @@ class MarketDataService(LoggerMixin):
             end_date: Optional end date filter (ISO format)
 
         Returns:
-            Tuple of (List of Sale DB models, Variant model, Product model)
+            Tuple of (List of SaleSummary projections, Variant model, Product model)
 
         Raises:
             ValueError: If variant or product not found
@@ -234,35 +328,41 @@ class MarketDataService(LoggerMixin):
         """
         self.logger.info(f"Fetching sales for variant {variant_db_id}")
 
+        reads = self._reads_for(variant_db_id)
+        cache_key = ("sales", start_date, end_date)
+        cached = reads.get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Serving cached sales for variant {variant_db_id}")
+            return cached
+
         # Look up variant by MongoDB ID
-        variant = await self.variant_repo.get_by_id(variant_db_id)
+        variant = await self.variant_repo.get_by_id_with_product(variant_db_id)
         if not variant:
             raise ValueError(f"Variant with ID {variant_db_id} not found")
 
-        # Fetch the linked product
-        await variant.fetch_link(variant.__class__.product)
+        # Product was joined by the variant lookup; an unresolved Link means it is missing
         product = variant.product
-        if not product:
+        if not product or isinstance(product, Link):
             raise ValueError(f"Product not found for variant {variant_db_id}")
 
         try:
             # Parse dates if provided
-            start_date_dt = None
-            end_date_dt = None
-            if start_date:
-                start_date_dt = datetime.fromisoformat(start_date)
-            if end_date:
-                end_date_dt = datetime.fromisoformat(end_date)
+            start_date_dt = _parse_iso_date(start_date) if start_date else None
+            end_date_dt = _parse_iso_date(end_date) if end_date else None
 
             # Fetch sales from database
             sales = await self.sale_repo.get_by_variant_db_id(
                 variant_db_id=variant_db_id,
                 start_date=start_date_dt,
-                end_date=end_date_dt
+                end_date=end_date_dt,
+                projection_model=SaleSummary
             )
 
             self.logger.info(f"Found {len(sales)} sales for variant {variant.variant_id}")
-            return sales, variant, product
+            result = (sales, variant, product)
+            if len(reads) < READ_CACHE_RANGES_PER_VARIANT:
+                reads[cache_key] = result
+            return result
 
         except DatabaseException as e:
             self.logger.error(f"Database operation failed: {e}")
@@ -286,7 +386,7 @@ class MarketDataService(LoggerMixin):
             end_date: Optional end date filter (ISO format)
 
         Returns:
-            Tuple of (List of HistoricalPricing DB models, Variant model, Product model)
+            Tuple of (List of HistoricalPricingSummary projections, Variant model, Product model)
 
         Raises:
             ValueError: If variant or product not found
@@ -294,35 +394,41 @@ class MarketDataService(LoggerMixin):
         """
         self.logger.info(f"Fetching historical pricing for variant {variant_db_id}")
 
+        reads = self._reads_for(variant_db_id)
+        cache_key = ("pricing", start_date, end_date)
+        cached = reads.get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Serving cached historical pricing for variant {variant_db_id}")
+            return cached
+
         # Look up variant by MongoDB ID
-        variant = await self.variant_repo.get_by_id(variant_db_id)
+        variant = await self.variant_repo.get_by_id_with_product(variant_db_id)
         if not variant:
             raise ValueError(f"Variant with ID {variant_db_id} not found")
 
-        # Fetch the linked product
-        await variant.fetch_link(variant.__class__.product)
+        # Product was joined by the variant lookup; an unresolved Link means it is missing
         product = variant.product
-        if not product:
+        if not product or isinstance(product, Link):
             raise ValueError(f"Product not found for variant {variant_db_id}")
 
         try:
             # Parse dates if provided
-            start_date_dt = None
-            end_date_dt = None
-            if start_date:
-                start_date_dt = datetime.fromisoformat(start_date)
-            if end_date:
-                end_date_dt = datetime.fromisoformat(end_date)
+            start_date_dt = _parse_iso_date(start_date) if start_date else None
+            end_date_dt = _parse_iso_date(end_date) if end_date else None
 
             # Fetch historical pricing from database
             pricing = await self.historical_pricing_repo.get_by_variant_db_id(
                 variant_db_id=variant_db_id,
                 start_date=start_date_dt,
-                end_date=end_date_dt
+                end_date=end_date_dt,
+                projection_model=HistoricalPricingSummary
             )
 
             self.logger.info(f"Found {len(pricing)} pricing records for variant {variant.variant_id}")
-            return pricing, variant, product
+            result = (pricing, variant, product)
+            if len(reads) < READ_CACHE_RANGES_PER_VARIANT:
+                reads[cache_key] = result
+            return result
 
         except DatabaseException as e:
             self.logger.error(f"Database operation failed: {e}")
@@ -332,5 +438,16 @@ class MarketDataService(LoggerMixin):
             raise DatabaseException(f"Failed to fetch historical pricing: {e}")
 
 
+@lru_cache(maxsize=1024)
+def _parse_iso_date(value: str) -> datetime:
+    """Parse an ISO date filter; repeated filter strings are parsed once."""
+    return datetime.fromisoformat(value)
+
+
+async def _empty_set() -> set:
+    """Awaitable stand-in for a key lookup that has nothing to check."""
+    return set()
+
+
 # Singleton instance
 market_data_service = MarketDataService()
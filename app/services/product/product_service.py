@@ -2,17 +2,42 @@
 Product Service.
 Handles business logic for creating and managing products and variants.
 """
+import asyncio
+import operator
 from typing import Tuple, List
 from app.repositories.product import product_repository
 from app.repositories.variant import variant_repository
 from app.services.stockx import stockx_service
+from app.core.concurrency import discard, gather_cancelling
 from app.core.logging import LoggerMixin
 from app.core.exceptions import APIClientException, DatabaseException
 from app.models.product import Product
 from app.models.variant import Variant
+from app.domain.factories import ProductFactory, VariantFactory
 from app.domain.product import Product as ProductDomain
 from app.domain.variant import Variant as VariantDomain
 
+# Up to this many new variants are fetched individually rather than listing
+# every variant of the product
+PER_VARIANT_FETCH_MAX = 4
+
+# Batches with more variants than this are converted to domain models in a worker thread
+CONVERSION_OFFLOAD_THRESHOLD = 32
+
+# Plain product fields copied as-is into repository data, read in one C-level call
+_PRODUCT_FIELDS = operator.attrgetter(
+    "title", "brand", "product_type", "url_key", "release_date", "retail_price"
+)
+
+
+async def _to_variant_domains(variant_docs: List[Variant]) -> List[VariantDomain]:
+    """Convert variant documents to domain models, in a worker thread for large batches."""
+    if len(variant_docs) > CONVERSION_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(
+            lambda: [VariantFactory.from_document(v) for v in variant_docs]
+        )
+    return [VariantFactory.from_document(v) for v in variant_docs]
+
 
 class ProductService(LoggerMixin):
     """
@@ -27,6 +52,51 @@ class ProductService(LoggerMixin):
         self.variant_repo = variant_repository
         self.stockx_service = stockx_service
 
+    @staticmethod
+    def _to_product_data(product_domain: ProductDomain) -> dict:
+        """
+        Build repository data for a product fetched from StockX.
+
+        Args:
+            product_domain: Product domain model
+
+        Returns:
+            Dictionary of Product document fields
+        """
+        title, brand, product_type, url_key, release_date, retail_price = _PRODUCT_FIELDS(product_domain)
+        return {
+            "product_id": product_domain.product_id.value,
+            "title": title,
+            "brand": brand,
+            "product_type": product_type,
+            "style_id": product_domain.style_id.value,
+            "url_key": url_key,
+            "retail_price": float(retail_price.amount) if retail_price else None,
+            "release_date": release_date
+        }
+
+    @staticmethod
+    def _to_variant_data(variant_domain: VariantDomain, product_doc: Product) -> dict:
+        """
+        Build repository data for a variant fetched from StockX.
+
+        Args:
+            variant_domain: Variant domain model
+            product_doc: Stored parent product, used as the Beanie Link target
+
+        Returns:
+            Dictionary of Variant document fields
+        """
+        upc = variant_domain.upc
+        return {
+            "variant_id": variant_domain.variant_id.value,
+            "product_id": variant_domain.product_id.value,
+            "product": product_doc,  # Beanie Link
+            "variant_name": variant_domain.variant_name,
+            "variant_value": variant_domain.variant_value,
+            "upc": upc.value if upc else None
+        }
+
     async def create_product(
         self,
         product_id: str
@@ -35,9 +105,8 @@ class ProductService(LoggerMixin):
         Create a product by fetching data from StockX API.
 
         This method will:
-        1. Check if product already exists
-        2. Fetch product data from StockX API
-        3. Save product to database
+        1. Check if product already exists while fetching its data from StockX API
+        2. Save product to database unless it was created in the meantime
 
         Args:
             product_id: StockX product UUID
@@ -52,36 +121,37 @@ class ProductService(LoggerMixin):
         """
         self.logger.info(f"Creating product {product_id}")
 
+        # Start the StockX fetch speculatively so it overlaps the existence check
+        self.logger.debug(f"Fetching product data for {product_id} from StockX API")
+        api_fetch = asyncio.ensure_future(self.stockx_service.get_product_by_id(product_id))
+
         # Check if product already exists
-        existing_product = await self.product_repo.get_by_product_id(product_id)
-        if existing_product:
+        try:
+            product_exists = await self.product_repo.product_exists(product_id)
+        except BaseException:
+            discard(api_fetch)
+            raise
+
+        if product_exists:
+            discard(api_fetch)
             self.logger.warning(f"Product {product_id} already exists")
             raise ValueError(f"Product with ID {product_id} already exists")
 
         try:
-            # Fetch product data from StockX API
-            self.logger.info(f"Fetching product data for {product_id} from StockX API")
-            product_domain = await self.stockx_service.get_product_by_id(product_id)
+            product_domain = await api_fetch
 
             # Prepare product data for repository
-            product_data = {
-                "product_id": product_domain.product_id.value,
-                "title": product_domain.title,
-                "brand": product_domain.brand,
-                "product_type": product_domain.product_type,
-                "style_id": product_domain.style_id.value,
-                "url_key": product_domain.url_key,
-                "retail_price": float(product_domain.retail_price.amount) if product_domain.retail_price else None,
-                "release_date": product_domain.release_date
-            }
+            product_data = self._to_product_data(product_domain)
 
-            # Save product to database using repository
-            self.logger.info(f"Saving product {product_id} to database")
-            product_doc = await self.product_repo.create(product_data)
+            # Save product unless it was created since the check, in one upsert
+            self.logger.debug(f"Saving product {product_id} to database")
+            product_doc = await self.product_repo.create_if_absent(product_data)
+            if product_doc is None:
+                self.logger.warning(f"Product {product_id} already exists")
+                raise ValueError(f"Product with ID {product_id} already exists")
 
             # Convert database model to domain model
-            from app.domain.factories import ProductFactory
-            product_domain_result = ProductFactory.from_database(product_doc.dict())
+            product_domain_result = ProductFactory.from_document(product_doc)
 
             self.logger.info(f"Successfully created product {product_id}")
 
@@ -94,9 +164,6 @@ class ProductService(LoggerMixin):
         except DatabaseException as e:
             self.logger.error(f"Failed to save to database: {e}")
             raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error creating product: {e}")
-            raise DatabaseException(f"Failed to create product: {e}")
 
     async def create_product_and_variant(
         self,
@@ -127,61 +194,56 @@ class ProductService(LoggerMixin):
         """
         self.logger.info(f"Creating product {product_id} and variant {variant_id}")
 
-        # Check if product already exists
-        existing_product = await self.product_repo.get_by_product_id(product_id)
-        if existing_product:
+        # Start the StockX fetches speculatively so they overlap the existence checks
+        self.logger.debug(
+            f"Fetching product {product_id} and variant {variant_id} from StockX API"
+        )
+        api_fetch = asyncio.ensure_future(gather_cancelling(
+            self.stockx_service.get_product_by_id(product_id),
+            self.stockx_service.get_variant(variant_id, product_id)
+        ))
+
+        # Check product and variant existence concurrently
+        try:
+            product_exists, variant_exists = await gather_cancelling(
+                self.product_repo.product_exists(product_id),
+                self.variant_repo.variant_exists(variant_id)
+            )
+        except BaseException:
+            discard(api_fetch)
+            raise
+
+        if product_exists:
+            discard(api_fetch)
             self.logger.warning(f"Product {product_id} already exists")
             raise ValueError(f"Product with ID {product_id} already exists")
 
         # Check if variant already exists
-        existing_variant = await self.variant_repo.get_by_variant_id(variant_id)
-        if existing_variant:
+        if variant_exists:
+            discard(api_fetch)
             self.logger.warning(f"Variant {variant_id} already exists")
             raise ValueError(f"Variant with ID {variant_id} already exists")
 
         try:
-            # Fetch product data from StockX API
-            self.logger.info(f"Fetching product data for {product_id} from StockX API")
-            product_domain = await self.stockx_service.get_product_by_id(product_id)
-
-            # Fetch variant data from StockX API (returns Variant domain model)
-            self.logger.info(f"Fetching variant data for {variant_id} from StockX API")
-            variant_domain = await self.stockx_service.get_variant(variant_id, product_id)
+            product_domain, variant_domain = await api_fetch
 
             # Prepare product data for repository
-            product_data = {
-                "product_id": product_domain.product_id.value,
-                "title": product_domain.title,
-                "brand": product_domain.brand,
-                "product_type": product_domain.product_type,
-                "style_id": product_domain.style_id.value,
-                "url_key": product_domain.url_key,
-                "retail_price": float(product_domain.retail_price.amount) if product_domain.retail_price else None,
-                "release_date": product_domain.release_date
-            }
+            product_data = self._to_product_data(product_domain)
 
             # Save product to database using repository
-            self.logger.info(f"Saving product {product_id} to database")
+            self.logger.debug(f"Saving product {product_id} to database")
             product_doc = await self.product_repo.create(product_data)
 
             # Prepare variant data for repository
-            variant_data = {
-                "variant_id": variant_domain.variant_id.value,
-                "product_id": variant_domain.product_id.value,
-                "product": product_doc,  # Beanie Link
-                "variant_name": variant_domain.variant_name,
-                "variant_value": variant_domain.variant_value,
-                "upc": variant_domain.upc.value if variant_domain.upc else None
-            }
+            variant_data = self._to_variant_data(variant_domain, product_doc)
 
             # Save variant to database using repository
-            self.logger.info(f"Saving variant {variant_id} to database")
+            self.logger.debug(f"Saving variant {variant_id} to database")
             variant_doc = await self.variant_repo.create(variant_data)
 
             # Convert database models to domain models
-            from app.domain.factories import ProductFactory, VariantFactory
-            product_domain_result = ProductFactory.from_database(product_doc.dict())
-            variant_domain_result = VariantFactory.from_database(variant_doc.dict())
+            product_domain_result = ProductFactory.from_document(product_doc)
+            variant_domain_result = VariantFactory.from_document(variant_doc)
 
             self.logger.info(
                 f"Successfully created product {product_id} and variant {variant_id}"
@@ -195,9 +257,6 @@ class ProductService(LoggerMixin):
         except DatabaseException as e:
             self.logger.error(f"Failed to save to database: {e}")
             raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error creating product and variant: {e}")
-            raise DatabaseException(f"Failed to create product and variant: {e}")
 
     async def add_variant_to_product(
         self,
@@ -227,40 +286,34 @@ class ProductService(LoggerMixin):
         """
         self.logger.info(f"Adding variant {variant_id} to product {product_id}")
 
-        # Check if product exists
-        existing_product = await self.product_repo.get_by_product_id(product_id)
+        # Check product and variant existence concurrently
+        existing_product, variant_exists = await gather_cancelling(
+            self.product_repo.get_by_product_id(product_id),
+            self.variant_repo.variant_exists(variant_id)
+        )
         if not existing_product:
             self.logger.warning(f"Product {product_id} not found")
             raise ValueError(f"Product with ID {product_id} does not exist")
 
         # Check if variant already exists
-        existing_variant = await self.variant_repo.get_by_variant_id(variant_id)
-        if existing_variant:
+        if variant_exists:
             self.logger.warning(f"Variant {variant_id} already exists")
             raise ValueError(f"Variant with ID {variant_id} already exists")
 
         try:
             # Fetch variant data from StockX API (returns Variant domain model)
-            self.logger.info(f"Fetching variant data for {variant_id} from StockX API")
+            self.logger.debug(f"Fetching variant data for {variant_id} from StockX API")
             variant_domain = await self.stockx_service.get_variant(variant_id, product_id)
 
             # Prepare variant data for repository
-            variant_data = {
-                "variant_id": variant_domain.variant_id.value,
-                "product_id": variant_domain.product_id.value,
-                "product": existing_product,  # Beanie Link to existing product
-                "variant_name": variant_domain.variant_name,
-                "variant_value": variant_domain.variant_value,
-                "upc": variant_domain.upc.value if variant_domain.upc else None
-            }
+            variant_data = self._to_variant_data(variant_domain, existing_product)
 
             # Save variant to database using repository
-            self.logger.info(f"Saving variant {variant_id} to database")
+            self.logger.debug(f"Saving variant {variant_id} to database")
             variant_doc = await self.variant_repo.create(variant_data)
 
             # Convert database model to domain model
-            from app.domain.factories import VariantFactory
-            variant_domain_result = VariantFactory.from_database(variant_doc.dict())
+            variant_domain_result = VariantFactory.from_document(variant_doc)
 
             self.logger.info(
                 f"Successfully added variant {variant_id} to product {product_id}"
@@ -275,9 +328,58 @@ class ProductService(LoggerMixin):
         except DatabaseException as e:
             self.logger.error(f"Failed to save variant to database: {e}")
             raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error adding variant to product: {e}")
-            raise DatabaseException(f"Failed to add variant to product: {e}")
+
+    async def _fetch_variants(
+        self,
+        product_id: str,
+        variant_ids: List[str]
+    ) -> List[VariantDomain]:
+        """
+        Fetch specific variants of a product from StockX API.
+
+        Up to PER_VARIANT_FETCH_MAX IDs are fetched concurrently with one
+        request each; larger sets list all of the product's variants once
+        and pick the requested ones.
+
+        Args:
+            product_id: StockX product UUID
+            variant_ids: StockX variant UUIDs to fetch
+
+        Returns:
+            Variant domain models in request order, without duplicates
+
+        Raises:
+            APIClientException: If StockX API call fails
+            ValueError: If any variant ID does not exist for the product
+        """
+        requested_ids = list(dict.fromkeys(variant_ids))
+
+        if len(requested_ids) <= PER_VARIANT_FETCH_MAX:
+            self.logger.debug(f"Fetching {len(requested_ids)} variants for product {product_id} from StockX API")
+            results = await asyncio.gather(
+                *(self.stockx_service.get_variant(vid, product_id) for vid in requested_ids),
+                return_exceptions=True
+            )
+            variants_by_id = {}
+            for vid, result in zip(requested_ids, results):
+                if isinstance(result, APIClientException) and result.details.get("status_code") == 404:
+                    continue
+                if isinstance(result, BaseException):
+                    raise result
+                variants_by_id[vid] = result
+        else:
+            self.logger.debug(f"Fetching all variants for product {product_id} from StockX API")
+            all_variants = await self.stockx_service.get_variants(product_id)
+            variants_by_id = {v.variant_id.value: v for v in all_variants}
+
+        # Check if all requested variants were found
+        missing_ids = set(requested_ids) - variants_by_id.keys()
+        if missing_ids:
+            raise ValueError(
+                f"The following variant IDs were not found for product {product_id}: {missing_ids}"
+            )
+
+        return [variants_by_id[vid] for vid in requested_ids]
 
     async def create_product_with_variants(
         self,
@@ -291,8 +393,9 @@ class ProductService(LoggerMixin):
         1. Check if product already exists, if so use existing product
         2. Filter out variants that already exist in database
         3. Fetch product data from StockX API (if product doesn't exist)
-        4. Fetch all variants for the product from StockX API
-        5. Filter variants by provided variant IDs and exclude existing ones
+        4. Fetch the new variants from StockX API, one by one for a few IDs
+           or by listing all of the product's variants otherwise
+        5. Verify every requested new variant exists in StockX
         6. Save product to database (if it doesn't exist)
         7. Save only new variants to database with link to product
 
@@ -312,127 +415,78 @@ class ProductService(LoggerMixin):
             f"Creating product {product_id} with {len(variant_ids)} variants"
         )
 
-        # Check if product already exists
-        existing_product = await self.product_repo.get_by_product_id(product_id)
+        # Check product existence and which variants already exist concurrently
+        existing_product, existing_variant_docs = await gather_cancelling(
+            self.product_repo.get_by_product_id(product_id),
+            self.variant_repo.get_by_variant_ids(variant_ids)
+        )
         product_exists = existing_product is not None
 
         if product_exists:
             self.logger.info(f"Product {product_id} already exists, will only add new variants")
 
-        # Check which variants already exist
-        existing_variant_ids = set()
-        for variant_id in variant_ids:
-            existing_variant = await self.variant_repo.get_by_variant_id(variant_id)
-            if existing_variant:
-                existing_variant_ids.add(variant_id)
-                self.logger.info(f"Variant {variant_id} already exists, skipping")
+        if existing_variant_docs:
+            self.logger.info(
+                f"{len(existing_variant_docs)} variants already exist, skipping: {sorted(existing_variant_docs)}"
+            )
 
         # Filter to only new variant IDs
-        new_variant_ids = [vid for vid in variant_ids if vid not in existing_variant_ids]
-
-        # Import factories at the beginning
-        from app.domain.factories import ProductFactory, VariantFactory
+        new_variant_ids = [vid for vid in variant_ids if vid not in existing_variant_docs]
 
         if not new_variant_ids and product_exists:
             self.logger.info("All variants already exist, nothing to create")
             # Return existing product and existing variants
-            product_domain = ProductFactory.from_database(existing_product.dict())
+            product_domain = ProductFactory.from_document(existing_product)
             product_db_id = str(existing_product.id)
 
-            # Get all existing variants for this product
-            existing_variants_db = await self.variant_repo.get_by_product_id(product_id)
-            # Filter to only the variants that were requested
-            requested_variant_id_set = set(variant_ids)
+            # Reuse the documents from the existence check, limited to this product
             filtered_existing_variants = [
-                v for v in existing_variants_db
-                if v.variant_id in requested_variant_id_set
+                existing_variant_docs[vid] for vid in dict.fromkeys(variant_ids)
+                if existing_variant_docs[vid].product_id == product_id
             ]
 
             # Convert to domain models and collect MongoDB IDs
-            existing_variants_domain = [
-                VariantFactory.from_database(v.dict()) for v in filtered_existing_variants
-            ]
+            existing_variants_domain = await _to_variant_domains(filtered_existing_variants)
             variant_db_ids = [str(v.id) for v in filtered_existing_variants]
 
             return product_domain, existing_variants_domain, product_db_id, variant_db_ids
 
         try:
-
-            # Fetch all variants for the product from StockX API
-            self.logger.info(f"Fetching all variants for product {product_id} from StockX API")
-            all_variants = await self.stockx_service.get_variants(product_id)
-
-            # Filter variants by NEW variant IDs only (excluding existing ones)
-            new_variant_id_set = set(new_variant_ids)
-            filtered_variants = [
-                v for v in all_variants
-                if v.variant_id.value in new_variant_id_set
-            ]
-
-            # Check if all requested new variants were found
-            found_variant_ids = {v.variant_id.value for v in filtered_variants}
-            missing_ids = new_variant_id_set - found_variant_ids
-            if missing_ids:
-                raise ValueError(
-                    f"The following variant IDs were not found for product {product_id}: {missing_ids}"
+            if not product_exists:
+                # Fetch the new variants and the product from StockX API concurrently
+                self.logger.debug(f"Fetching product data for {product_id} from StockX API")
+                filtered_variants, product_domain = await gather_cancelling(
+                    self._fetch_variants(product_id, new_variant_ids),
+                    self.stockx_service.get_product_by_id(product_id)
                 )
-
-            self.logger.info(
-                f"Found {len(filtered_variants)} new variants to create out of {len(all_variants)} total variants"
-            )
+            else:
+                # Fetch the requested new variants from StockX API
+                filtered_variants = await self._fetch_variants(product_id, new_variant_ids)
+            self.logger.info(f"Found {len(filtered_variants)} new variants to create")
 
             # Create or use existing product
             if not product_exists:
-                # Fetch product data from StockX API
-                self.logger.info(f"Fetching product data for {product_id} from StockX API")
-                product_domain = await self.stockx_service.get_product_by_id(product_id)
-
                 # Prepare product data for repository
-                product_data = {
-                    "product_id": product_domain.product_id.value,
-                    "title": product_domain.title,
-                    "brand": product_domain.brand,
-                    "product_type": product_domain.product_type,
-                    "style_id": product_domain.style_id.value,
-                    "url_key": product_domain.url_key,
-                    "retail_price": float(product_domain.retail_price.amount) if product_domain.retail_price else None,
-                    "release_date": product_domain.release_date
-                }
+                product_data = self._to_product_data(product_domain)
 
                 # Save product to database using repository
-                self.logger.info(f"Saving product {product_id} to database")
+                self.logger.debug(f"Saving product {product_id} to database")
                 product_doc = await self.product_repo.create(product_data)
             else:
                 product_doc = existing_product
 
-            # Save all new filtered variants
-            variant_docs = []
-            for idx, variant_domain in enumerate(filtered_variants, 1):
-                self.logger.info(
-                    f"Saving variant {variant_domain.variant_id.value} ({idx}/{len(filtered_variants)}) to database"
-                )
-
-                # Prepare variant data for repository
-                variant_data = {
-                    "variant_id": variant_domain.variant_id.value,
-                    "product_id": variant_domain.product_id.value,
-                    "product": product_doc,  # Beanie Link
-                    "variant_name": variant_domain.variant_name,
-                    "variant_value": variant_domain.variant_value,
-                    "upc": variant_domain.upc.value if variant_domain.upc else None
-                }
-
-                # Save variant to database using repository
-                variant_doc = await self.variant_repo.create(variant_data)
-                variant_docs.append(variant_doc)
+            # Save all new filtered variants in one bulk insert
+            self.logger.debug(f"Saving {len(filtered_variants)} variants to database")
+            variant_docs = await self.variant_repo.create_many([
+                self._to_variant_data(variant_domain, product_doc)
+                for variant_domain in filtered_variants
+            ])
 
             # Convert database models to domain models and collect MongoDB IDs
-            product_domain_result = ProductFactory.from_database(product_doc.dict())
+            product_domain_result = ProductFactory.from_document(product_doc)
             product_db_id = str(product_doc.id)
 
-            variant_domain_results = [
-                VariantFactory.from_database(v.dict()) for v in variant_docs
-            ]
+            variant_domain_results = await _to_variant_domains(variant_docs)
             variant_db_ids = [str(v.id) for v in variant_docs]
 
             self.logger.info(
@@ -447,9 +501,6 @@ class ProductService(LoggerMixin):
         except DatabaseException as e:
             self.logger.error(f"Failed to save to database: {e}")
             raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error creating product with variants: {e}")
-            raise DatabaseException(f"Failed to create product with variants: {e}")
 
     async def get_all_products_with_variants(
         self,
@@ -472,16 +523,11 @@ class ProductService(LoggerMixin):
         self.logger.info(f"Fetching all products with variants (skip={skip}, limit={limit})")
 
         try:
-            # Fetch all products with pagination
-            products_db = await self.product_repo.get_all(skip=skip, limit=limit)
-
-            products_with_variants = []
-            for product_db in products_db:
-                # Get all variants for this product
-                variants_db = await self.variant_repo.get_by_product_id(product_db.product_id)
-
-                # Return database models directly for read operations
-                products_with_variants.append((product_db, variants_db))
+            # Fetch a page of products joined with their variants in one query
+            # Return database models directly for read operations
+            products_with_variants = await self.product_repo.get_all_with_variants(
+                skip=skip, limit=limit
+            )
 
             self.logger.info(
                 f"Successfully fetched {len(products_with_variants)} products with their variants"
@@ -492,9 +538,6 @@ class ProductService(LoggerMixin):
         except DatabaseException as e:
             self.logger.error(f"Failed to fetch products with variants: {e}")
             raise
-        except Exception as e:
-            self.logger.error(f"Unexpected error fetching products with variants: {e}")
-            raise DatabaseException(f"Failed to fetch products with variants: {e}")
 
 
 # Singleton instance
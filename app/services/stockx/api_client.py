@@ -1,21 +1,101 @@
 """External API client service for fetching StockX data."""
+import asyncio
+import logging
+import random
+import time
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+from typing import AsyncGenerator, Dict, Any, List, Optional
 
+from app.core.cache import SingleFlight, TTLCache
+from app.core.concurrency import discard
 from app.core.config import settings
 from app.core.exceptions import APIClientException
 from app.core.logging import LoggerMixin
 from app.services.stockx.auth_service import auth_service
 from app.schemas.stockx import CreateBatchListingsRequest, UpdateBatchListingsRequest
 
+# Upper bound on cached catalog and market data responses
+CATALOG_CACHE_MAXSIZE = 1_000
+MARKET_DATA_CACHE_MAXSIZE = 10_000
+# 404s for cached lookups are remembered briefly so dead IDs are not re-requested
+NOT_FOUND_CACHE_MAXSIZE = 10_000
+NOT_FOUND_CACHE_TTL_SECONDS = 60.0
+
+# Idle pooled connections are dropped after this many seconds
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Connection setup gets its own, shorter budget than reads and writes
+CONNECT_TIMEOUT_SECONDS = 5.0
+POOL_TIMEOUT_SECONDS = 5.0
+# Failed connection attempts are retried by the transport before any request is sent
+CONNECT_RETRIES = 2
+
+# Retry policy for transient GET failures (429, 5xx, network errors)
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE_SECONDS = 0.5
+RETRY_BACKOFF_MAX_SECONDS = 8.0
+RETRY_JITTER_SECONDS = 0.5
+
+# After this many consecutive requests fail transiently (retries exhausted),
+# requests fail fast for CIRCUIT_RESET_SECONDS instead of queueing on a
+# struggling API; the first failure after that re-opens the circuit
+CIRCUIT_FAILURE_THRESHOLD = 20
+CIRCUIT_RESET_SECONDS = 30.0
+
 
 class StockXAPIClient(LoggerMixin):
     """Client for interacting with StockX API with OAuth authentication."""
 
     def __init__(self):
         self.base_url = settings.stockx_api_url
+        self.api_key = settings.stockx_api_key
         self.timeout = 30.0
         self.auth_service = auth_service
+        self._catalog_cache: TTLCache[Any] = TTLCache(
+            maxsize=CATALOG_CACHE_MAXSIZE,
+            ttl=settings.stockx_catalog_cache_ttl_seconds
+        )
+        # Prices move, so market data is only reused for a short window
+        self._market_data_cache: TTLCache[Any] = TTLCache(
+            maxsize=MARKET_DATA_CACHE_MAXSIZE,
+            ttl=settings.stockx_market_data_cache_ttl_seconds
+        )
+        # Details of recent 404s, keyed like the response caches
+        self._not_found_cache: TTLCache[Dict[str, Any]] = TTLCache(
+            maxsize=NOT_FOUND_CACHE_MAXSIZE,
+            ttl=NOT_FOUND_CACHE_TTL_SECONDS
+        )
+        self._single_flight: SingleFlight[Any] = SingleFlight()
+        # Caps concurrent StockX requests so fan-outs don't trip rate limits
+        self._request_slots = asyncio.Semaphore(settings.stockx_max_concurrency)
+        # Circuit breaker state; the deadline is on the time.monotonic() clock
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+        # Long-lived client so keep-alive connections are reused across calls;
+        # HTTP/2 lets concurrent requests share one connection as parallel streams
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=CONNECT_RETRIES,
+            limits=httpx.Limits(
+                max_connections=settings.stockx_max_concurrency,
+                max_keepalive_connections=settings.stockx_max_concurrency,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url or "",
+            transport=transport,
+            timeout=httpx.Timeout(
+                self.timeout,
+                connect=CONNECT_TIMEOUT_SECONDS,
+                pool=POOL_TIMEOUT_SECONDS
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections. Call once on application shutdown."""
+        await self._client.aclose()
 
     async def _make_request(
         self,
@@ -28,82 +108,185 @@ class StockXAPIClient(LoggerMixin):
 
         Args:
             method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint path
+            endpoint: API endpoint path, relative to the client's base URL
             use_auth: Whether to include OAuth token (default: True)
             **kwargs: Additional arguments for httpx
 
+        Idempotent GETs that hit a 429, a 5xx or a network error are retried
+        with exponential backoff and jitter, honouring a Retry-After header of up
+        to RETRY_BACKOFF_MAX_SECONDS; a longer hint fails the request instead.
+        While the circuit breaker is open, requests fail without being sent.
+
         Returns:
             JSON response data
 
         Raises:
-            APIClientException: If request fails
+            APIClientException: If request fails or the circuit is open
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = kwargs.pop("headers", {})
+        self._check_circuit()
+
+        extra_headers = kwargs.pop("headers", None)
+        headers = extra_headers
+        retryable = method == "GET"
+
+        # On a 401 the token is refreshed and the request sent once more
+        token_refreshed = False
+        auth_headers: Dict[str, str] = {}
+        retries = 0
+        while True:
+            # Add OAuth token if required
+            if use_auth:
+                try:
+                    # The background refresher normally keeps the token valid, so no await is needed
+                    cached_headers = self.auth_service.cached_auth_headers()
+                    if cached_headers is None:
+                        cached_headers = await self.auth_service.get_auth_headers()
+                    auth_headers = cached_headers
+                    headers = {**auth_headers, **extra_headers} if extra_headers else auth_headers
+                except APIClientException as e:
+                    self.logger.error(f"Failed to get access token: {str(e)}")
+                    raise
 
-        # Add OAuth token if required
-        if use_auth:
             try:
-                access_token = await self.auth_service.get_access_token()
-                headers["Authorization"] = f"Bearer {access_token}"
-                headers["x-api-key"] = settings.stockx_api_key
-            except APIClientException as e:
-                self.logger.error(f"Failed to get access token: {str(e)}")
-                raise
-
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    **kwargs
-                )
+                async with self._request_slots:
+                    response = await self._client.request(
+                        method=method,
+                        url=endpoint,
+                        headers=headers,
+                        **kwargs
+                    )
                 response.raise_for_status()
-                return response.json()
-
-        except httpx.HTTPStatusError as e:
-            error_msg = e.response.text
-            self.logger.error(
-                f"API request failed with status {e.response.status_code}: {error_msg}"
-            )
-
-            # If 401, try refreshing token once
-            if e.response.status_code == 401 and use_auth:
-                self.logger.info("Received 401, attempting to refresh token")
-                self.auth_service.clear_token_cache()
+                self._consecutive_failures = 0
+                return orjson.loads(response.content)
+
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                # A Retry-After beyond the backoff cap is surfaced rather than waited out
+                retry_after = _retry_after_seconds(e.response.headers.get("Retry-After"))
+                if (
+                    retryable and _is_transient(status_code) and retries < MAX_RETRIES
+                    and (retry_after is None or retry_after <= RETRY_BACKOFF_MAX_SECONDS)
+                ):
+                    delay = _retry_delay(retries, retry_after)
+                    retries += 1
+                    self.logger.warning(
+                        f"Transient failure on {method} {endpoint} (status {status_code}), "
+                        f"retry {retries}/{MAX_RETRIES} in {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if _is_transient(status_code):
+                    self._record_failure()
+
+                error_msg = e.response.text
+                # A 404 is an expected answer for lookups; callers report it in context
+                log = self.logger.debug if status_code == 404 else self.logger.error
+                log(f"API request failed with status {e.response.status_code}: {error_msg}")
+
+                if e.response.status_code == 401 and use_auth:
+                    if not token_refreshed:
+                        self.logger.info("Received 401, attempting to refresh token")
+                        # Concurrent 401s share one refresh: only the first drops the token
+                        self.auth_service.discard_rejected_token(auth_headers)
+                        token_refreshed = True
+                        continue
 
-                # Retry with fresh token
-                try:
-                    access_token = await self.auth_service.get_access_token(force_refresh=True)
-                    headers["Authorization"] = f"Bearer {access_token}"
-
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.request(
-                            method=method,
-                            url=url,
-                            headers=headers,
-                            **kwargs
-                        )
-                        response.raise_for_status()
-                        return response.json()
-                except Exception as retry_error:
-                    self.logger.error(f"Retry with fresh token failed: {str(retry_error)}")
                     raise APIClientException(
                         "Authentication failed even after token refresh",
-                        details={"error": str(retry_error)}
+                        details={"status_code": 401, "error": error_msg}
+                    )
+
+                raise APIClientException(
+                    f"API request failed: {e.response.status_code}",
+                    details={"status_code": e.response.status_code, "error": error_msg}
+                )
+            except httpx.RequestError as e:
+                if retryable and retries < MAX_RETRIES:
+                    delay = _retry_delay(retries, None)
+                    retries += 1
+                    self.logger.warning(
+                        f"Transient failure on {method} {endpoint} ({str(e) or e.__class__.__name__}), "
+                        f"retry {retries}/{MAX_RETRIES} in {delay:.2f}s"
                     )
+                    await asyncio.sleep(delay)
+                    continue
+                self._record_failure()
+
+                self.logger.error(f"API request error: {str(e)}")
+                raise APIClientException(f"Failed to connect to API: {str(e)}")
+            except Exception as e:
+                self.logger.error(f"Unexpected API error: {str(e)}")
+                raise APIClientException(f"API request failed: {str(e)}")
 
+    def _check_circuit(self) -> None:
+        """Raise without sending anything while the circuit breaker is open.
+
+        Raises:
+            APIClientException: If the circuit is open
+        """
+        remaining = self._circuit_open_until - time.monotonic()
+        if remaining > 0:
             raise APIClientException(
-                f"API request failed: {e.response.status_code}",
-                details={"status_code": e.response.status_code, "error": error_msg}
+                "StockX API temporarily unavailable after repeated failures",
+                details={"retry_after": round(remaining, 1)}
             )
-        except httpx.RequestError as e:
-            self.logger.error(f"API request error: {str(e)}")
-            raise APIClientException(f"Failed to connect to API: {str(e)}")
-        except Exception as e:
-            self.logger.error(f"Unexpected API error: {str(e)}")
-            raise APIClientException(f"API request failed: {str(e)}")
+
+    def _record_failure(self) -> None:
+        """Count a transient failure, opening the circuit once the threshold is reached."""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._circuit_open_until = time.monotonic() + CIRCUIT_RESET_SECONDS
+            self.logger.warning(
+                f"{self._consecutive_failures} consecutive StockX API failures, "
+                f"failing fast for {CIRCUIT_RESET_SECONDS:.0f}s"
+            )
+
+    async def _cached_get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, str]] = None,
+        cache: Optional[TTLCache[Any]] = None
+    ) -> Any:
+        """GET an endpoint, reusing a recent response for the same request.
+
+        Catalog data changes rarely, so by default responses are kept for
+        stockx_catalog_cache_ttl_seconds, and concurrent misses for one
+        request share a single call. A 404 is replayed without a request for
+        NOT_FOUND_CACHE_TTL_SECONDS.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters, part of the cache key
+            cache: Cache to use instead of the catalog cache
+
+        Returns:
+            JSON response data (shared; callers must not mutate it)
+
+        Raises:
+            APIClientException: If request fails
+        """
+        cache = self._catalog_cache if cache is None else cache
+        key = (endpoint, tuple(sorted(params.items()))) if params else endpoint
+        data = cache.get(key)
+        if data is not None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Cache hit for {endpoint}")
+            return data
+
+        not_found = self._not_found_cache.get(key)
+        if not_found is not None:
+            raise APIClientException("API request failed: 404", details=not_found)
+
+        try:
+            data = await self._single_flight.run(
+                key, lambda: self._make_request("GET", endpoint, params=params)
+            )
+        except APIClientException as e:
+            if e.details.get("status_code") == 404:
+                self._not_found_cache.set(key, e.details)
+            raise
+        cache.set(key, data)
+        return data
 
     async def fetch_product_data(self, search_param: str) -> Dict[str, Any]:
         """Fetch product information from the API by search query.
@@ -118,10 +301,11 @@ class StockXAPIClient(LoggerMixin):
         """
         self.logger.info(f"Fetching product data for: {search_param}")
 
-        endpoint = f"/v2/catalog/search?query={search_param}"
+        endpoint = "/v2/catalog/search"
+        params = {"query": search_param}
 
         try:
-            data = await self._make_request("GET", endpoint)
+            data = await self._cached_get(endpoint, params)
             return data
         except APIClientException:
             self.logger.warning(f"Failed to fetch product data for {search_param}")
@@ -159,7 +343,7 @@ class StockXAPIClient(LoggerMixin):
         endpoint = f"/v2/catalog/products/{product_id}"
 
         try:
-            data = await self._make_request("GET", endpoint)
+            data = await self._cached_get(endpoint)
             return data
         except APIClientException:
             self.logger.warning(f"Failed to fetch product {product_id}")
@@ -179,12 +363,36 @@ class StockXAPIClient(LoggerMixin):
         endpoint = f"/v2/catalog/products/{product_id}/variants"
 
         try:
-            data = await self._make_request("GET", endpoint)
+            data = await self._cached_get(endpoint)
             return data
         except APIClientException:
             self.logger.warning(f"Failed to fetch variant data for {product_id}")
             raise
 
+    async def warm_variant_data(self, product_id: str) -> bool:
+        """Load a product's variants into the cache, treating an unknown product as a miss.
+
+        Used to request variants speculatively, before it is known whether
+        product_id names a product, so a 404 is not reported as a failure.
+
+        Args:
+            product_id: Possible StockX Product identifier
+
+        Returns:
+            True if the variants are now cached, False if the product does not exist
+
+        Raises:
+            APIClientException: If the request fails for any other reason
+        """
+        try:
+            await self._cached_get(f"/v2/catalog/products/{product_id}/variants")
+            return True
+        except APIClientException as e:
+            if e.details.get("status_code") != 404:
+                raise
+            self.logger.debug(f"No variants to warm for {product_id}: not a product ID")
+            return False
+
     async def fetch_single_variant(self, product_id: str, variant_id: str) -> Dict[str, Any]:
         """Fetch a single variant by product ID and variant ID.
 
@@ -212,7 +420,7 @@ class StockXAPIClient(LoggerMixin):
         endpoint = f"/v2/catalog/products/{product_id}/variants/{variant_id}"
 
         try:
-            data = await self._make_request("GET", endpoint)
+            data = await self._cached_get(endpoint)
             return data
         except APIClientException:
             self.logger.warning(
@@ -228,6 +436,8 @@ class StockXAPIClient(LoggerMixin):
     ) -> Dict[str, Any]:
         """Fetch market data for a specific product variant.
 
+        Responses are reused for stockx_market_data_cache_ttl_seconds.
+
         Args:
             product_id: StockX Product identifier
             variant_id: StockX Variant identifier
@@ -251,7 +461,7 @@ class StockXAPIClient(LoggerMixin):
         params = {"currencyCode": currency_code}
 
         try:
-            data = await self._make_request("GET", endpoint, params=params)
+            data = await self._cached_get(endpoint, params, cache=self._market_data_cache)
             return data
         except APIClientException:
             self.logger.warning(
@@ -298,10 +508,12 @@ class StockXAPIClient(LoggerMixin):
         if not product_id and not variant_id:
             raise ValueError("Either product_id or variant_id must be provided")
 
-        self.logger.info(
-            f"Fetching listings for product={product_id}, variant={variant_id}, "
-            f"page={page_number}, size={page_size}"
-        )
+        # Logged per page, so kept out of INFO and only formatted when enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"Fetching listings for product={product_id}, variant={variant_id}, "
+                f"page={page_number}, size={page_size}"
+            )
 
         endpoint = "/v2/selling/listings"
 
@@ -330,6 +542,143 @@ class StockXAPIClient(LoggerMixin):
             )
             raise
 
+    async def fetch_all_listings(
+        self,
+        product_id: Optional[str] = None,
+        variant_id: Optional[str] = None,
+        page_size: int = 100,
+        from_date: Optional[str] = None,
+        listing_status: str = "ACTIVE"
+    ) -> List[Dict[str, Any]]:
+        """Fetch every page of listings from StockX selling API.
+
+        Pages are fetched as by iter_listing_pages and collected in page order.
+
+        Args:
+            product_id: StockX Product identifier (optional if variant_id provided)
+            variant_id: StockX Variant identifier (optional if product_id provided)
+            page_size: Number of items per page (default: 100)
+            from_date: Filter listings from this date (format: YYYY-MM-DD)
+            listing_status: Filter by listing status (default: ACTIVE)
+
+        Returns:
+            Raw listing dictionaries from all pages, in page order
+
+        Raises:
+            APIClientException: If any page request fails
+            ValueError: If neither product_id nor variant_id is provided
+        """
+        listings: List[Dict[str, Any]] = []
+        pages = self.iter_listing_pages(
+            product_id=product_id,
+            variant_id=variant_id,
+            page_size=page_size,
+            from_date=from_date,
+            listing_status=listing_status,
+            ordered=True
+        )
+        async for page in pages:
+            listings.extend(page.get("listings", []))
+        return listings
+
+    async def iter_listing_pages(
+        self,
+        product_id: Optional[str] = None,
+        variant_id: Optional[str] = None,
+        page_size: int = 100,
+        from_date: Optional[str] = None,
+        listing_status: str = "ACTIVE",
+        ordered: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield listing pages from StockX selling API as they arrive.
+
+        The first page reports the total count, so the remaining pages are
+        requested concurrently (bounded by the client's request slots) and
+        callers can process one page while the rest are still in flight. If
+        the count is missing, pages are walked one by one via hasNextPage,
+        prefetching the next. Closing the iterator early cancels pending pages.
+
+        Args:
+            product_id: StockX Product identifier (optional if variant_id provided)
+            variant_id: StockX Variant identifier (optional if product_id provided)
+            page_size: Number of items per page (default: 100)
+            from_date: Filter listings from this date (format: YYYY-MM-DD)
+            listing_status: Filter by listing status (default: ACTIVE)
+            ordered: Yield pages in page order rather than as each completes
+
+        Yields:
+            Raw listings page dictionaries
+
+        Raises:
+            APIClientException: If any page request fails
+            ValueError: If neither product_id nor variant_id is provided
+        """
+        async def fetch_page(page_number: int) -> Dict[str, Any]:
+            return await self.fetch_listings(
+                product_id=product_id,
+                variant_id=variant_id,
+                page_number=page_number,
+                page_size=page_size,
+                from_date=from_date,
+                listing_status=listing_status
+            )
+
+        async def follow(
+            page: Dict[str, Any],
+            page_number: int,
+            include_first: bool
+        ) -> AsyncGenerator[Dict[str, Any], None]:
+            # Walk pages in order via hasNextPage, requesting the next page
+            # before handing over the current one so they overlap
+            next_fetch: Optional[asyncio.Future] = None
+            try:
+                while True:
+                    # An empty page ends the walk even if it claims more follow
+                    if page.get("hasNextPage", False) and page.get("listings"):
+                        page_number += 1
+                        next_fetch = asyncio.ensure_future(fetch_page(page_number))
+                    else:
+                        next_fetch = None
+                    if include_first:
+                        yield page
+                    include_first = True
+                    if next_fetch is None:
+                        return
+                    page = await next_fetch
+            finally:
+                if next_fetch is not None:
+                    discard(next_fetch)
+
+        page = await fetch_page(1)
+        total_count = page.get("count")
+        # The server may cap the page size below the one requested, so the
+        # page count is derived from what it actually returned
+        served = len(page.get("listings", []))
+
+        if not page.get("hasNextPage", False) or not isinstance(total_count, int) or not served:
+            rest = follow(page, 1, include_first=True)
+        else:
+            # Start the remaining pages before handing over the first
+            page_count = -(-total_count // served)
+            tasks = [asyncio.ensure_future(fetch_page(n)) for n in range(2, page_count + 1)]
+            try:
+                yield page
+                for next_page in (tasks if ordered else asyncio.as_completed(tasks)):
+                    yield await next_page
+            finally:
+                for task in tasks:
+                    discard(task)
+
+            # If the count undershot, keep following hasNextPage from the last page
+            last_page = tasks[-1].result() if tasks else page
+            rest = follow(last_page, max(page_count, 1), include_first=False)
+
+        try:
+            async for next_page in rest:
+                yield next_page
+        finally:
+            await rest.aclose()
+
     async def create_batch_listings(
         self,
         items: CreateBatchListingsRequest
@@ -375,5 +724,30 @@ class StockXAPIClient(LoggerMixin):
         except Exception as e:
             self.logger.error(f"Failed to update batch listings: {e}")
             raise APIClientException(f"Failed to update batch listings: {e}")
+
+
+def _is_transient(status_code: int) -> bool:
+    """Whether a response status is worth retrying."""
+    return status_code == 429 or status_code >= 500
+
+
+def _retry_after_seconds(header: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds, or None if absent or not numeric."""
+    if header is None:
+        return None
+    try:
+        return max(float(header), 0.0)
+    except ValueError:
+        return None
+
+
+def _retry_delay(attempt: int, retry_after: Optional[float]) -> float:
+    """Delay before the next retry: the server's Retry-After if given, else capped exponential backoff, plus jitter."""
+    delay = retry_after
+    if delay is None:
+        delay = RETRY_BACKOFF_BASE_SECONDS * (2 ** attempt)
+    return min(RETRY_BACKOFF_MAX_SECONDS, delay) + random.uniform(0, RETRY_JITTER_SECONDS)
+
+
 # Singleton instance
 api_client = StockXAPIClient()
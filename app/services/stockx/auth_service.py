@@ -1,12 +1,23 @@
 """StockX OAuth authentication service."""
+import asyncio
+import time
 import httpx
-from datetime import datetime, timedelta
+import orjson
 from typing import Optional, Dict, Any
 
 from app.core.config import settings
 from app.core.exceptions import APIClientException
 from app.core.logging import LoggerMixin
 
+# The background refresher renews the token this long before it is due to expire
+PROACTIVE_REFRESH_LEAD_SECONDS = 60.0
+# Wait between refresher attempts after a failed refresh
+REFRESH_RETRY_SECONDS = 30.0
+# Shortest wait between successful refreshes, so short-lived tokens can't cause a tight loop
+MIN_REFRESH_INTERVAL_SECONDS = 30.0
+# Cached tokens are treated as expired this long before the server says so
+TOKEN_EXPIRY_BUFFER_SECONDS = 300.0
+
 
 class StockXAuthService(LoggerMixin):
     """Service for handling StockX OAuth authentication."""
@@ -18,10 +29,56 @@ class StockXAuthService(LoggerMixin):
         self.refresh_token = settings.stockx_refresh_token
         self.grant_type = settings.stockx_grant_type
         self.audience = settings.stockx_audience
+        self.api_key = settings.stockx_api_key
 
         # Cache for access token
         self._access_token: Optional[str] = None
-        self._token_expiry: Optional[datetime] = None
+        # time.monotonic() deadline, immune to wall-clock jumps
+        self._token_expiry: float = 0.0
+        # Request headers for the cached token, rebuilt only when it changes
+        self._auth_headers: Dict[str, str] = {}
+        # Serializes refreshes so concurrent callers share one token request
+        self._refresh_lock = asyncio.Lock()
+
+        # Long-lived client for the auth host, separate from the API host's pool
+        self._client = httpx.AsyncClient(timeout=30.0)
+
+    async def aclose(self) -> None:
+        """Close pooled connections. Call once on application shutdown."""
+        await self._client.aclose()
+
+    def has_credentials(self) -> bool:
+        """Whether the OAuth credentials and API key needed to call StockX are configured."""
+        return all([self.client_id, self.client_secret, self.refresh_token, self.api_key])
+
+    def cached_auth_headers(self) -> Optional[Dict[str, str]]:
+        """Return the auth headers for the cached token without awaiting, or None if it is not valid."""
+        return self._auth_headers if self._is_token_valid() else None
+
+    async def run_refresher(self) -> None:
+        """Keep the cached token fresh so requests never wait on a refresh.
+
+        Renews the token shortly before it expires and runs until cancelled;
+        start it as a background task on application startup.
+        """
+        while True:
+            due_in = self._token_expiry - time.monotonic() - PROACTIVE_REFRESH_LEAD_SECONDS
+            if due_in > 0:
+                await asyncio.sleep(due_in)
+                continue
+
+            try:
+                await self.get_access_token(force_refresh=True)
+            except APIClientException as e:
+                self.logger.warning(
+                    f"Background token refresh failed, retrying in {REFRESH_RETRY_SECONDS:.0f}s: {e.message}"
+                )
+                await asyncio.sleep(REFRESH_RETRY_SECONDS)
+                continue
+
+            # A short-lived token can already be due again; never refresh back to back
+            due_in = self._token_expiry - time.monotonic() - PROACTIVE_REFRESH_LEAD_SECONDS
+            await asyncio.sleep(max(due_in, MIN_REFRESH_INTERVAL_SECONDS))
 
     async def get_access_token(self, force_refresh: bool = False) -> Optional[str]:
         """Get a valid access token, refreshing if necessary.
@@ -40,19 +97,54 @@ class StockXAuthService(LoggerMixin):
             self.logger.debug("Using cached access token")
             return self._access_token
 
-        # Fetch new token
-        self.logger.info("Fetching new access token from StockX")
-        token_data = await self._fetch_access_token()
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not force_refresh and self._is_token_valid():
+                return self._access_token
+
+            # Every request carries the key alongside the token, so fail before fetching one
+            api_key = self.api_key
+            if not api_key:
+                raise APIClientException(
+                    "Missing StockX API key. Please set STOCKX_API_KEY in .env file"
+                )
+
+            # Fetch new token
+            self.logger.info("Fetching new access token from StockX")
+            token_data = await self._fetch_access_token()
+
+            # Cache the token
+            self._access_token = token_data.get("access_token")
+            expires_in = token_data.get("expires_in", 3600)  # Default 1 hour
 
-        # Cache the token
-        self._access_token = token_data.get("access_token")
-        expires_in = token_data.get("expires_in", 3600)  # Default 1 hour
+            # Set expiry with a buffer of up to 5 minutes, halved for short-lived
+            # tokens so the expiry never lands before now
+            buffer = min(TOKEN_EXPIRY_BUFFER_SECONDS, expires_in / 2)
+            self._token_expiry = time.monotonic() + max(expires_in - buffer, 0.0)
+            self._auth_headers = {
+                "Authorization": f"Bearer {self._access_token}",
+                "x-api-key": api_key
+            }
+
+            self.logger.info(f"Access token acquired, expires in {expires_in} seconds")
+            return self._access_token
 
-        # Set expiry with 5 minute buffer
-        self._token_expiry = datetime.utcnow() + timedelta(seconds=expires_in - 300)
+    async def get_auth_headers(self, force_refresh: bool = False) -> Dict[str, str]:
+        """Get the StockX API auth headers for a valid access token.
 
-        self.logger.info(f"Access token acquired, expires in {expires_in} seconds")
-        return self._access_token
+        The same dict is returned until the token changes; callers must not mutate it.
+
+        Args:
+            force_refresh: Force token refresh even if cached token is valid
+
+        Returns:
+            Authorization and x-api-key headers
+
+        Raises:
+            APIClientException: If token acquisition fails
+        """
+        await self.get_access_token(force_refresh=force_refresh)
+        return self._auth_headers
 
     async def _fetch_access_token(self) -> Dict[str, Any]:
         """Fetch access token from StockX OAuth endpoint.
@@ -63,7 +155,7 @@ class StockXAuthService(LoggerMixin):
         Raises:
             APIClientException: If token request fails
         """
-        if not all([self.client_id, self.client_secret, self.refresh_token]):
+        if not self.has_credentials():
             raise APIClientException(
                 "Missing StockX OAuth credentials. Please set STOCKX_CLIENT_ID, "
                 "STOCKX_CLIENT_SECRET, and STOCKX_REFRESH_TOKEN in .env file"
@@ -82,20 +174,19 @@ class StockXAuthService(LoggerMixin):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.auth_url,
-                    headers=headers,
-                    data=data
-                )
+            response = await self._client.post(
+                self.auth_url,
+                headers=headers,
+                data=data
+            )
 
-                response.raise_for_status()
-                token_data = response.json()
+            response.raise_for_status()
+            token_data = orjson.loads(response.content)
 
-                if "access_token" not in token_data:
-                    raise APIClientException("Invalid token response: missing access_token")
+            if "access_token" not in token_data:
+                raise APIClientException("Invalid token response: missing access_token")
 
-                return token_data
+            return token_data
 
         except httpx.HTTPStatusError as e:
             error_detail = e.response.text
@@ -119,15 +210,27 @@ class StockXAuthService(LoggerMixin):
         Returns:
             True if token exists and hasn't expired
         """
-        if not self._access_token or not self._token_expiry:
-            return False
+        return bool(self._access_token) and time.monotonic() < self._token_expiry
+
+    def discard_rejected_token(self, rejected_headers: Dict[str, str]) -> None:
+        """Clear the cached token if it is the one a request was rejected with.
 
-        return datetime.utcnow() < self._token_expiry
+        When several requests are rejected together, the first clears the
+        token and the others find it already replaced, so the next
+        get_auth_headers call shares a single refresh under the lock instead
+        of each caller forcing its own.
+
+        Args:
+            rejected_headers: Auth headers the rejected request was sent with
+        """
+        if self._auth_headers.get("Authorization") == rejected_headers.get("Authorization"):
+            self.clear_token_cache()
 
     def clear_token_cache(self) -> None:
         """Clear the cached access token."""
         self._access_token = None
-        self._token_expiry = None
+        self._token_expiry = 0.0
+        self._auth_headers = {}
         self.logger.info("Access token cache cleared")
 
 
@@ -2,8 +2,9 @@
 StockX API response mapper.
 Transforms raw API responses into domain models.
 """
-from datetime import datetime
-from typing import Dict, Any, Optional
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 from app.core.exceptions import APIClientException
 from app.domain import (
     Product,
@@ -16,10 +17,78 @@ from app.domain import (
     MarketDataFactory,
 )
 
+# datetime.fromisoformat only accepts a trailing "Z" from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def _parse_iso8601(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp, returning None if it is missing or malformed."""
+    if value is None:
+        return None
+    try:
+        if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _variant_factory_data(variant_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build VariantFactory input from a raw StockX variant."""
+    return {
+        "variant_id": variant_data["variantId"],
+        "product_id": variant_data["productId"],
+        "variant_name": variant_data["variantName"],
+        "variant_value": variant_data["variantValue"],
+        # Extract UPC from gtins array (find where type="UPC")
+        "upc": StockXMapper.extract_upc(variant_data.get("gtins", [])),
+    }
+
+
+def _listing_factory_data(listing_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build ListingFactory input from a raw StockX listing."""
+    ask = listing_data.get("ask", {})
+    product = listing_data.get("product", {})
+    variant = listing_data.get("variant", {})
+    batch = listing_data.get("batch", {})
+
+    return {
+        "listing_id": listing_data.get("listingId"),
+        "amount": listing_data.get("amount"),
+        "currency_code": listing_data.get("currencyCode", "USD"),
+        "status": listing_data.get("status"),
+        "inventory_type": listing_data.get("inventoryType"),
+        "created_at": _parse_iso8601(listing_data.get("createdAt")),
+        "updated_at": _parse_iso8601(listing_data.get("updatedAt")),
+
+        # Ask details
+        "ask_id": ask.get("askId"),
+        "ask_created_at": _parse_iso8601(ask.get("askCreatedAt")),
+        "ask_updated_at": _parse_iso8601(ask.get("askUpdatedAt")),
+        "ask_expires_at": _parse_iso8601(ask.get("askExpiresAt")),
+
+        # Product details
+        "product_id": product.get("productId"),
+        "product_name": product.get("productName"),
+        "style_id": product.get("styleId"),
+
+        # Variant details
+        "variant_id": variant.get("variantId"),
+        "variant_name": variant.get("variantName"),
+        "variant_value": variant.get("variantValue"),
+
+        # Batch details
+        "batch_id": batch.get("batchId"),
+        "task_id": batch.get("taskId"),
+    }
+
 
 class StockXMapper:
     """Maps StockX API responses to domain models."""
 
+    # Stateless: every method is static, so instances need no __dict__
+    __slots__ = ()
+
     @staticmethod
     def to_product(api_response: Dict[str, Any]) -> Product:
         """
@@ -110,12 +179,13 @@ class StockXMapper:
             raise APIClientException(f"Error transforming product data: {e}")
 
     @staticmethod
-    def to_variant(variant_data: Dict[str, Any]) -> Variant:
+    def to_variant(variant_data: Dict[str, Any], now: Optional[datetime] = None) -> Variant:
         """
         Transform StockX variant API response to Variant domain model.
 
         Args:
             variant_data: Raw variant data from API
+            now: Shared fallback timestamp when mapping a batch (default: current time)
 
         Returns:
             Variant domain model instance
@@ -124,26 +194,33 @@ class StockXMapper:
             APIClientException: If required fields are missing
         """
         try:
-            # Extract UPC from gtins array (find where type="UPC")
-            upc = None
-            gtins = variant_data.get("gtins", [])
-            for gtin in gtins:
-                if gtin.get("type") == "UPC":
-                    upc = gtin.get("identifier")
-                    break
+            return VariantFactory.from_stockx_api(_variant_factory_data(variant_data), now=now)
 
-            # Prepare data dictionary for factory
-            factory_data = {
-                "variant_id": variant_data["variantId"],
-                "product_id": variant_data["productId"],
-                "variant_name": variant_data["variantName"],
-                "variant_value": variant_data["variantValue"],
-                "upc": upc,
-            }
+        except KeyError as e:
+            raise APIClientException(f"Missing required field in variant API response: {e}")
+        except Exception as e:
+            raise APIClientException(f"Error transforming variant data: {e}")
 
-            # Use factory to create domain model
-            variant = VariantFactory.from_stockx_api(factory_data)
-            return variant
+    @staticmethod
+    def to_variants(variants_data: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Variant]:
+        """
+        Transform a list of StockX variants to Variant domain models.
+
+        Args:
+            variants_data: Raw variant data from API
+            now: Shared fallback timestamp (default: current time, read once)
+
+        Returns:
+            Variant domain model instances, in input order
+
+        Raises:
+            APIClientException: If any variant is missing required fields
+        """
+        build = _variant_factory_data
+        make = VariantFactory.from_stockx_api
+        now = now or datetime.utcnow()
+        try:
+            return [make(build(variant_data), now=now) for variant_data in variants_data]
 
         except KeyError as e:
             raise APIClientException(f"Missing required field in variant API response: {e}")
@@ -173,12 +250,13 @@ class StockXMapper:
             raise APIClientException(f"Error transforming market data: {e}")
 
     @staticmethod
-    def to_listing(listing_data: Dict[str, Any]) -> Listing:
+    def to_listing(listing_data: Dict[str, Any], now: Optional[datetime] = None) -> Listing:
         """
         Transform a single StockX listing to Listing domain model.
 
         Args:
             listing_data: Raw listing data from API
+            now: Shared fallback timestamp when mapping a batch (default: current time)
 
         Returns:
             Listing domain model instance
@@ -187,54 +265,32 @@ class StockXMapper:
             APIClientException: If required fields are missing
         """
         try:
-            # Helper to parse datetime strings
-            def to_datetime(value):
-                if value is None:
-                    return None
-                try:
-                    return datetime.fromisoformat(value.replace('Z', '+00:00'))
-                except (ValueError, TypeError, AttributeError):
-                    return None
-
-            ask = listing_data.get("ask", {})
-            product = listing_data.get("product", {})
-            variant = listing_data.get("variant", {})
-            batch = listing_data.get("batch", {})
+            return ListingFactory.from_stockx_api(_listing_factory_data(listing_data), now=now)
 
-            # Prepare data dictionary for factory
-            factory_data = {
-                "listing_id": listing_data.get("listingId"),
-                "amount": listing_data.get("amount"),
-                "currency_code": listing_data.get("currencyCode", "USD"),
-                "status": listing_data.get("status"),
-                "inventory_type": listing_data.get("inventoryType"),
-                "created_at": to_datetime(listing_data.get("createdAt")),
-                "updated_at": to_datetime(listing_data.get("updatedAt")),
-
-                # Ask details
-                "ask_id": ask.get("askId"),
-                "ask_created_at": to_datetime(ask.get("askCreatedAt")),
-                "ask_updated_at": to_datetime(ask.get("askUpdatedAt")),
-                "ask_expires_at": to_datetime(ask.get("askExpiresAt")),
-
-                # Product details
-                "product_id": product.get("productId"),
-                "product_name": product.get("productName"),
-                "style_id": product.get("styleId"),
-
-                # Variant details
-                "variant_id": variant.get("variantId"),
-                "variant_name": variant.get("variantName"),
-                "variant_value": variant.get("variantValue"),
-
-                # Batch details
-                "batch_id": batch.get("batchId"),
-                "task_id": batch.get("taskId"),
-            }
+        except Exception as e:
+            raise APIClientException(f"Error transforming listing data: {e}")
 
-            # Use factory to create domain model
-            listing = ListingFactory.from_stockx_api(factory_data)
-            return listing
+    @staticmethod
+    def to_listings(listings: List[Dict[str, Any]]) -> List[Listing]:
+        """
+        Transform a page of StockX listings to Listing domain models.
+
+        Args:
+            listings: Raw listing data from API
+
+        Returns:
+            Listing domain model instances, in input order
+
+        Raises:
+            APIClientException: If any listing cannot be transformed
+        """
+        # Local bindings keep the per-item lookups out of the globals dict
+        build = _listing_factory_data
+        make = ListingFactory.from_stockx_api
+        # One timestamp for any listing missing created_at/updated_at
+        now = datetime.now(timezone.utc)
+        try:
+            return [make(build(listing_data), now=now) for listing_data in listings]
 
         except Exception as e:
             raise APIClientException(f"Error transforming listing data: {e}")
@@ -250,10 +306,10 @@ class StockXMapper:
         Returns:
             UPC identifier string or None if not found
         """
-        for gtin in gtins:
-            if gtin.get("type") == "UPC":
-                return gtin.get("identifier")
-        return None
+        return next(
+            (gtin.get("identifier") for gtin in gtins if gtin.get("type") == "UPC"),
+            None
+        )
 
     @staticmethod
     def to_create_batch_listings_response(api_response: Dict[str, Any]) -> Dict[str, Any]:
@@ -273,4 +329,8 @@ class StockXMapper:
                 "total_items": api_response.get("totalItems")
             }
         except Exception as e:
-            raise APIClientException(f"Error transforming create batch listings data: {e}")
\ No newline at end of file
+            raise APIClientException(f"Error transforming create batch listings data: {e}")
+
+
+# Singleton instance
+stockx_mapper = StockXMapper()
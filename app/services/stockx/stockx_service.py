@@ -2,15 +2,37 @@
 StockX Service Wrapper.
 Orchestrates API calls and transforms responses into domain models.
 """
-from typing import List, Tuple, Dict, Any, Optional
+import asyncio
+import re
+from typing import (
+    Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+)
 from app.services.stockx.api_client import api_client
-from app.services.stockx.mapper import StockXMapper
+from app.services.stockx.mapper import stockx_mapper
+from app.core.concurrency import discard, gather_cancelling
+from app.core.config import settings
 from app.core.logging import LoggerMixin
 from app.core.exceptions import APIClientException
 from app.schemas.stockx import CreateBatchListingsRequest
 from app.schemas.stockx import UpdateBatchListingsRequest
 from app.domain import Product, Variant, Listing, MarketData
 
+# Variant batches larger than this are mapped in a worker thread to keep the
+# event loop responsive; listings are mapped a page at a time instead
+MAPPING_OFFLOAD_THRESHOLD = 200
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+# Market data requests a prefetch may have in flight at once
+MARKET_PREFETCH_CONCURRENCY = 5
+
+# StockX product IDs are UUIDs; style IDs and UPCs never match this
+_UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+
 class StockXService(LoggerMixin):
     """
     Wrapper service that transforms StockX API responses into domain models.
@@ -23,7 +45,22 @@ class StockXService(LoggerMixin):
     def __init__(self):
         """Initialize the StockX service."""
         self.api_client = api_client
-        self.mapper = StockXMapper()
+        self.mapper = stockx_mapper
+
+        # Best-effort market data prefetches; references are held until done
+        self._prefetch_slots = asyncio.Semaphore(MARKET_PREFETCH_CONCURRENCY)
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+
+    async def aclose(self) -> None:
+        """
+        Stop background prefetches and close the API client's pooled connections.
+
+        The service owns the shared API client; call once on application shutdown.
+        """
+        for task in self._prefetch_tasks:
+            task.cancel()
+        await asyncio.gather(*self._prefetch_tasks, return_exceptions=True)
+        await self.api_client.aclose()
 
     async def get_product(self, search_param: str) -> Product:
         """
@@ -135,12 +172,14 @@ class StockXService(LoggerMixin):
             self.logger.error(f"Unexpected error fetching variant {variant_id}: {e}")
             raise APIClientException(f"Failed to fetch variant: {e}")
 
-    async def get_variants(self, product_id: str) -> List[Variant]:
+    async def get_variants(self, product_id: str, prefetch_market: bool = False) -> List[Variant]:
         """
         Fetch variant data from StockX API and transform to Variant domain models.
 
         Args:
             product_id: The StockX product ID
+            prefetch_market: Warm the market data cache for every variant in
+                the background, for callers about to ask for it
 
         Returns:
             List of Variant domain model instances
@@ -158,13 +197,22 @@ class StockXService(LoggerMixin):
             if not isinstance(api_response, list):
                 raise APIClientException("Expected variant API response to be a list")
 
-            # Transform each variant to domain model
-            variants = [self.mapper.to_variant(variant_data) for variant_data in api_response if isinstance(variant_data, dict)]
+            # Transform the variants to domain models in one batch
+            variants_data: List[Dict[str, Any]] = [
+                variant_data for variant_data in api_response if isinstance(variant_data, dict)
+            ]
+            if len(variants_data) > MAPPING_OFFLOAD_THRESHOLD:
+                variants = await asyncio.to_thread(self.mapper.to_variants, variants_data)
+            else:
+                variants = self.mapper.to_variants(variants_data)
 
             self.logger.info(
                 f"Successfully fetched and transformed {len(variants)} variants for product {product_id}"
             )
 
+            if prefetch_market:
+                self._prefetch_market_data(product_id, variants)
+
             return variants
 
         except APIClientException as e:
@@ -179,7 +227,10 @@ class StockXService(LoggerMixin):
         Fetch both product and its variants in one operation.
 
         This is a convenience method that fetches the product first,
-        then uses the product_id to fetch all variants.
+        then uses the product_id to fetch all variants. When search_param
+        already looks like a product ID, its variants are requested
+        speculatively alongside the product search; on a match the variant
+        fetch joins or reuses that request, and on a mismatch it is dropped.
 
         Args:
             search_param: Style ID or UPC to search for
@@ -192,12 +243,23 @@ class StockXService(LoggerMixin):
         """
         self.logger.info(f"Fetching product with variants for: {search_param}")
 
+        speculative = None
+        if _UUID_PATTERN.fullmatch(search_param):
+            speculative = asyncio.ensure_future(self.api_client.warm_variant_data(search_param))
+
         try:
             # Fetch product first
             product = await self.get_product(search_param)
+            product_id = product.product_id.value
 
-            # Fetch variants using product_id
-            variants = await self.get_variants(product.product_id.value)
+            # Fetch variants using product_id; if the speculative guess was
+            # right this shares its request (or its cached response)
+            if speculative is not None and product_id != search_param:
+                self.logger.debug(
+                    f"Speculative variant fetch missed: {search_param} resolved to {product_id}"
+                )
+                discard(speculative)
+            variants = await self.get_variants(product_id)
 
             self.logger.info(
                 f"Successfully fetched product {product.product_id.value} with {len(variants)} variants"
@@ -213,6 +275,39 @@ class StockXService(LoggerMixin):
                 f"Unexpected error fetching product with variants for {search_param}: {e}"
             )
             raise APIClientException(f"Failed to fetch product with variants: {e}")
+        finally:
+            # Also retrieves the speculative outcome, which nothing else awaits
+            if speculative is not None:
+                discard(speculative)
+
+    async def get_product_with_variants_by_id(self, product_id: str) -> Tuple[Product, List[Variant]]:
+        """
+        Fetch a product and its variants by product ID.
+
+        Unlike get_product_with_variants, no search is needed to learn the
+        product ID, so both calls are made concurrently.
+
+        Args:
+            product_id: StockX Product identifier (UUID)
+
+        Returns:
+            Tuple of (Product domain model, list of Variant domain models)
+
+        Raises:
+            APIClientException: If either API call fails
+        """
+        self.logger.info(f"Fetching product with variants by ID: {product_id}")
+
+        product, variants = await gather_cancelling(
+            self.get_product_by_id(product_id),
+            self.get_variants(product_id)
+        )
+
+        self.logger.info(
+            f"Successfully fetched product {product_id} with {len(variants)} variants"
+        )
+
+        return product, variants
 
     async def get_market_data(
         self,
@@ -264,6 +359,117 @@ class StockXService(LoggerMixin):
             )
             raise APIClientException(f"Failed to fetch market data: {e}")
 
+    async def get_products_bulk(
+        self,
+        search_params: List[str]
+    ) -> Dict[str, Union[Product, Exception]]:
+        """
+        Fetch products for several style IDs or UPCs concurrently.
+
+        Args:
+            search_params: Style IDs or UPCs to search for
+
+        Returns:
+            Mapping of search term to its product, or to the exception raised
+        """
+        return await self._fetch_many(search_params, self.get_product, "products")
+
+    async def get_variants_bulk(
+        self,
+        product_ids: List[str]
+    ) -> Dict[str, Union[List[Variant], Exception]]:
+        """
+        Fetch variants for several products concurrently.
+
+        Args:
+            product_ids: StockX product UUIDs
+
+        Returns:
+            Mapping of product ID to its variants, or to the exception raised
+        """
+        return await self._fetch_many(product_ids, self.get_variants, "product variant lists")
+
+    async def get_market_data_bulk(
+        self,
+        pairs: List[Tuple[str, str]],
+        currency_code: str = "USD"
+    ) -> Dict[Tuple[str, str], Union[MarketData, Exception]]:
+        """
+        Fetch market data for several product variants concurrently.
+
+        Args:
+            pairs: (product_id, variant_id) pairs
+            currency_code: Currency code for pricing (default: USD)
+
+        Returns:
+            Mapping of (product_id, variant_id) to its market data, or to the exception raised
+        """
+        async def _fetch(pair: Tuple[str, str]) -> MarketData:
+            return await self.get_market_data(pair[0], pair[1], currency_code)
+
+        return await self._fetch_many(pairs, _fetch, "variant market data")
+
+    async def _fetch_many(
+        self,
+        keys: List[K],
+        fetch: Callable[[K], Awaitable[R]],
+        label: str
+    ) -> Dict[K, Union[R, Exception]]:
+        """
+        Run fetch for each distinct key concurrently, collecting per-key outcomes.
+
+        At most stockx_max_concurrency fetches run at once, and identical
+        requests also share the client's cache and in-flight call. One key
+        failing does not stop the others; cancellation is not swallowed.
+
+        Args:
+            keys: Keys to fetch; duplicates are fetched once
+            fetch: Coroutine function fetching one key
+            label: What is being fetched, for the summary log
+
+        Returns:
+            Mapping of key to its result, or to the exception it raised
+        """
+        semaphore = asyncio.Semaphore(settings.stockx_max_concurrency)
+        keys = list(dict.fromkeys(keys))
+
+        async def _one(key: K) -> R:
+            async with semaphore:
+                return await fetch(key)
+
+        results = await asyncio.gather(*(_one(key) for key in keys), return_exceptions=True)
+
+        outcomes: Dict[K, Union[R, Exception]] = {}
+        failed = 0
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                failed += 1
+                outcomes[key] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                outcomes[key] = result
+
+        self.logger.info(f"Fetched {len(keys) - failed}/{len(keys)} {label}")
+        return outcomes
+
+    def _prefetch_market_data(self, product_id: str, variants: List[Variant]) -> None:
+        """Start background requests that fill the market data cache for the given variants."""
+        for variant in variants:
+            task = asyncio.ensure_future(
+                self._prefetch_variant_market_data(product_id, str(variant.variant_id.value))
+            )
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch_variant_market_data(self, product_id: str, variant_id: str) -> None:
+        """Fetch one variant's market data into the cache, ignoring failures."""
+        async with self._prefetch_slots:
+            try:
+                await self.api_client.fetch_market_data(product_id, variant_id)
+            except APIClientException as e:
+                self.logger.debug(f"Market data prefetch failed for variant {variant_id}: {e}")
+
     async def get_listings(
         self,
         product_id: Optional[str] = None,
@@ -297,44 +503,30 @@ class StockXService(LoggerMixin):
             f"fetch_all={fetch_all_pages}"
         )
 
-        all_listings = []
-        page_number = 1
-        has_next_page = True
-
         try:
-            while has_next_page:
-                # Fetch current page
+            if fetch_all_pages:
+                # Map each page while later pages are still in flight
+                all_listings = [
+                    listing async for listing in self.iter_listings(
+                        product_id=product_id,
+                        variant_id=variant_id,
+                        from_date=from_date,
+                        listing_status=listing_status,
+                        ordered=True
+                    )
+                ]
+            else:
                 api_response = await self.api_client.fetch_listings(
                     product_id=product_id,
                     variant_id=variant_id,
-                    page_number=page_number,
+                    page_number=1,
                     page_size=100,
                     from_date=from_date,
                     listing_status=listing_status
                 )
+                all_listings = self.mapper.to_listings(api_response.get("listings", []))
 
-                # Transform each listing to domain model
-                listings = api_response.get("listings", [])
-                for listing_data in listings:
-                    listing = self.mapper.to_listing(listing_data)
-                    all_listings.append(listing)
-
-                self.logger.info(
-                    f"Fetched page {page_number}: {len(listings)} listings "
-                    f"(total so far: {len(all_listings)})"
-                )
-
-                # Check if we should continue to next page
-                has_next_page = api_response.get("hasNextPage", False) and fetch_all_pages
-
-                if has_next_page:
-                    page_number += 1
-                else:
-                    break
-
-            self.logger.info(
-                f"Successfully fetched {len(all_listings)} total listings across {page_number} page(s)"
-            )
+            self.logger.info(f"Successfully fetched {len(all_listings)} total listings")
 
             return all_listings
 
@@ -349,6 +541,51 @@ class StockXService(LoggerMixin):
             )
             raise APIClientException(f"Failed to fetch listings: {e}")
 
+    async def iter_listings(
+        self,
+        product_id: Optional[str] = None,
+        variant_id: Optional[str] = None,
+        from_date: Optional[str] = None,
+        listing_status: str = "ACTIVE",
+        ordered: bool = False
+    ) -> AsyncGenerator[Listing, None]:
+        """
+        Stream listings from every page as Listing domain models.
+
+        Listings are mapped and yielded as each page arrives, so callers can
+        start processing before the remaining pages have been fetched, and
+        only one page of listings is held at a time. Breaking out early
+        cancels the pages still in flight.
+
+        Args:
+            product_id: StockX Product identifier (optional if variant_id provided)
+            variant_id: StockX Variant identifier (optional if product_id provided)
+            from_date: Filter listings from this date (format: YYYY-MM-DD)
+            listing_status: Filter by listing status (default: ACTIVE)
+            ordered: Yield pages in page order rather than completion order
+
+        Yields:
+            Listing domain model instances
+
+        Raises:
+            APIClientException: If API call fails
+            ValueError: If neither product_id nor variant_id is provided
+        """
+        pages = self.api_client.iter_listing_pages(
+            product_id=product_id,
+            variant_id=variant_id,
+            page_size=100,
+            from_date=from_date,
+            listing_status=listing_status,
+            ordered=ordered
+        )
+        try:
+            async for page in pages:
+                for listing in self.mapper.to_listings(page.get("listings", [])):
+                    yield listing
+        finally:
+            await pages.aclose()
+
     async def create_batch_listings(self, items: CreateBatchListingsRequest) -> Dict[str, Any]:
         """Create batch listings in StockX selling API.
 